@@ -0,0 +1,58 @@
+"""
+    Compares blitting the game's images as loaded from disk with blitting them
+    once ImageCache has converted them to the display format.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.blit
+"""
+
+import time
+
+import pygame
+
+from Source.image_cache import ImageCache
+
+
+IMAGES = ["tiles_and_enemies.png", "player.png", "items.png", "bg.jpg"]
+COLORKEY = {"tiles_and_enemies.png": (27, 25, 25)}  # see level1.ts.json
+BLITS = 2000
+
+
+def _throughput(screen: pygame.Surface, image: pygame.Surface) -> float:
+    """
+    Returns how many times per second the image can be blitted to the screen.
+    """
+    w, h = screen.get_size()
+
+    start = time.perf_counter()
+    for i in range(BLITS):
+        screen.blit(image, (i * 7 % w, i * 13 % h))
+    return BLITS / (time.perf_counter() - start)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    images = ImageCache()
+
+    print(f"{'image':>22} {'loaded':>12} {'converted':>12} {'speedup':>8}")
+
+    for name in IMAGES:
+        raw = pygame.image.load("Resources/Images/" + name)
+        uid = images.load(name)
+
+        if name in COLORKEY:
+            raw.set_colorkey(COLORKEY[name])
+            images.set_colorkey(uid, COLORKEY[name])
+
+        before = _throughput(screen, raw)
+        after = _throughput(screen, images.unsafe_get(uid))
+
+        print(f"{name:>22} {before:>10.0f}/s {after:>10.0f}/s {after / before:>7.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+    Compares loading a map from JSON with loading it compiled to .wamap.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.map_load
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+
+from Source import wamap
+from Source.image_cache import ImageCache
+from Source.tilemap import TileMap
+
+
+SIZES = [10_000, 1_000_000, 10_000_000]
+HEIGHT = 100
+
+
+def _make_map(base: dict, count: int) -> dict:
+    """
+    The objects of `base` on a random tile layer with `count` tiles.
+    """
+    rng = random.Random(count)
+
+    data = dict(base)
+    data["height"] = HEIGHT
+    data["tiles"] = [rng.choice((0, 0, 0, 54, 55)) for _ in range(count)]
+
+    return data
+
+
+def _time(path: str, images: ImageCache) -> float:
+    start = time.perf_counter()
+    TileMap.load(path, images)
+    return time.perf_counter() - start
+
+
+def main():
+    with open("./Resources/Maps/level1.json", "r") as f:
+        base = json.load(f)
+
+    images = ImageCache()
+
+    print(f"{'tiles':>10} {'json':>10} {'size':>10} {'wamap':>10} {'size':>10} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for count in SIZES:
+            data = _make_map(base, count)
+
+            json_path = os.path.join(folder, f"{count}.json")
+            wamap_path = os.path.join(folder, f"{count}.wamap")
+
+            with open(json_path, "w") as f:
+                json.dump(data, f)
+
+            wamap.write(wamap_path, data)
+
+            t_json = _time(json_path, images)
+            t_wamap = _time(wamap_path, images)
+
+            json_size = os.path.getsize(json_path) / 1024 / 1024
+            wamap_size = os.path.getsize(wamap_path) / 1024 / 1024
+
+            print(f"{count:>10} {t_json * 1000:>7.1f} ms {json_size:>7.2f} MB "
+                  f"{t_wamap * 1000:>7.2f} ms {wamap_size:>7.2f} MB {t_json / t_wamap:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
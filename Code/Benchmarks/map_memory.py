@@ -0,0 +1,59 @@
+"""
+    Compares the memory used by the tile layer of a 1M-tile map,
+    stored as a list of ints (as TileMap used to) and as a uint16 array.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.map_memory
+"""
+
+import json
+import random
+import tracemalloc
+
+import numpy as np
+
+from Source.tilemap import Tile, TileId, Tileset
+
+
+COUNT = 1_000_000
+
+
+def _measure(build) -> tuple[object, int]:
+    """
+    Returns what `build` returns and how many bytes it allocated for it.
+    """
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return value, size
+
+
+def main():
+    with open("./Resources/Maps/level1.ts.json", "r") as f:
+        ts = json.load(f)
+
+    tids = [int(tile["tid"]) for tile in ts["tiles"]]
+
+    # as parsed from a JSON map
+    rng = random.Random(0)
+    parsed = [rng.choice(tids) if rng.random() < 0.4 else 0 for _ in range(COUNT)]
+
+    _, as_list = _measure(lambda: [TileId(int(tile)) for tile in parsed])
+    _, as_array = _measure(lambda: np.asarray(parsed, dtype=np.uint16))
+
+    tiles = {
+        TileId(int(tile["tid"])): Tile(offset=tile["offset"], properties=tile.get("properties", {}))
+        for tile in ts["tiles"]
+    }
+    (rects, flags), _ = _measure(lambda: Tileset.lookup(tiles, ts["tile_size"]))
+
+    print(f"tiles: {COUNT}, tile ids up to {max(tids)}")
+    print(f"list[TileId]:  {as_list / 1024 / 1024:>7.2f} MB")
+    print(f"uint16 array:  {as_array / 1024 / 1024:>7.2f} MB ({as_list / as_array:.1f}x smaller)")
+    print(f"lookup tables: {(rects.nbytes + flags.nbytes) / 1024:>7.2f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+    Compares loading a long level whole with opening it streamed, where only the chunks
+    around the camera are loaded, then the time a frame of the object systems takes
+    with every object of the map resident and with the streamed ones, as the camera scrolls.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.map_stream
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pygame
+
+from Source.column_store import ColumnStore
+from Source.components import *
+from Source.entity import Entity
+from Source.image_cache import ImageCache
+from Source.map_stream import MapStream
+from Source.scenes.level import parse
+from Source.systems.animations import update_animations
+from Source.systems.enemies import update_enemies
+from Source.systems.gravity import gravity
+from Source.systems.physics import solid_tiles, update_physics
+from Source.tilemap import TileMap
+
+
+REPEATS = [10, 100, 1000]  # how many times level 1 is repeated, side by side
+CHUNK = 16
+FRAMES = 200
+STEP = 16  # how far the camera moves every frame, in pixels
+DT = 16
+
+
+def _make_map(base: dict, repeats: int) -> dict:
+    """
+    Level 1 repeated `repeats` times to the right, with a single player.
+    """
+    height = int(base["height"])
+    width = len(base["tiles"]) // height
+    grid = np.asarray(base["tiles"])[:width * height].reshape(height, width)
+
+    objects = []
+    for r in range(repeats):
+        for obj in base["objects"]:
+            if r > 0 and obj.get("properties", {}).get("type") == "player":
+                continue
+
+            objects.append(dict(obj, offset={"x": obj["offset"]["x"] + r * width, "y": obj["offset"]["y"]}))
+
+    return dict(base, tiles=np.tile(grid, (1, repeats)).ravel().tolist(), objects=objects)
+
+
+def _prepare(obj: Entity):
+    """
+    What Level does to the objects of its map.
+    """
+    obj.add(Velocity(0, 0))
+    obj.add(Active())
+
+
+def _frame(tilemap: TileMap, solid, area: pygame.Rect, scale: int, stream: MapStream | None = None) -> float:
+    """
+    The average time of a frame of the systems which update every object, scrolling the camera,
+    with the streamed chunks loaded and evicted on the way.
+    """
+    area = pygame.Rect(area)
+
+    start = time.perf_counter()
+
+    for _ in range(FRAMES):
+        area.x += STEP
+
+        if stream is not None:
+            stream.update(area, scale)
+
+        update_animations(tilemap.objects, DT)
+        update_enemies(tilemap.objects, DT)
+        gravity(tilemap.objects)
+        update_physics(
+            tilemap.objects, DT,
+            tile_size=tilemap.tileset.tile_size, tiles=tilemap.tiles,
+            map_w=tilemap.width, map_h=tilemap.height, solid=solid)
+
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+
+    with open("./Resources/Maps/level1.json", "r") as f:
+        base = json.load(f)
+
+    images = ImageCache()
+    area = pygame.Rect(0, 0, 800, 600)
+
+    print(f"{'tiles':>10} {'objects':>8} {'load':>10} {'stream':>10} {'resident':>8} "
+          f"{'whole':>10} {'streamed':>10}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for repeats in REPEATS:
+            data = _make_map(base, repeats)
+
+            path = os.path.join(folder, f"{repeats}.json")
+            with open(path, "w") as f:
+                json.dump(data, f)
+
+            stream = os.path.join(folder, f"{repeats}.stream")
+            subprocess.run([sys.executable, "-m", "Tools.split_map", path, stream, "--chunk", str(CHUNK)],
+                           check=True, stdout=subprocess.DEVNULL)
+
+            start = time.perf_counter()
+            tilemap = TileMap.load(path, images, parse)
+            t_load = time.perf_counter() - start
+
+            scale = 600 // 16 // tilemap.height
+
+            start = time.perf_counter()
+            streamed = MapStream(stream, images, parse, prepare=_prepare)
+            streamed.update(area, scale, wait=True)
+            t_stream = time.perf_counter() - start
+
+            resident = len(streamed.map.objects.entities)
+
+            tilemap.objects.attach(ColumnStore(Position, Velocity, Size, Collider))
+            for obj in tilemap.objects.all():
+                _prepare(obj)
+
+            solid = solid_tiles(tilemap.tiles, tilemap.width, tilemap.height, tilemap.tileset.flags)
+            t_frame = _frame(tilemap, solid, area, scale)
+
+            streamed.map.objects.attach(ColumnStore(Position, Velocity, Size, Collider))
+            t_streamed = _frame(streamed.map, streamed.solid, area, scale, streamed)
+
+            print(f"{len(data['tiles']):>10} {len(data['objects']):>8} {t_load * 1000:>7.1f} ms "
+                  f"{t_stream * 1000:>7.1f} ms {resident:>8} "
+                  f"{t_frame * 1000:>7.2f} ms {t_streamed * 1000:>7.2f} ms")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+    Compares the per-entity physics path with the batch (column store) one.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.physics
+"""
+
+import random
+import time
+
+import pygame
+
+from Source.column_store import ColumnStore
+from Source.components import *
+from Source.entity import Entity
+from Source.entity_list import EntityList
+from Source.systems.gravity import gravity
+from Source.systems.physics import solid_tiles, update_physics
+from Source.tilemap import TileId
+
+
+TILE_SIZE = (8, 8)
+MAP_W, MAP_H = 2000, 10
+STEPS = 60
+DT = 16
+
+
+def _make_tiles(rng: random.Random) -> list[TileId]:
+    """
+    A floor with some holes and a few floating platforms.
+    """
+    tiles = [TileId(0)] * (MAP_W * MAP_H)
+
+    for i in range(MAP_W):
+        if rng.random() > 0.1:
+            tiles[(MAP_H - 1) * MAP_W + i] = TileId(55)
+        if rng.random() < 0.2:
+            tiles[rng.randrange(3, MAP_H - 1) * MAP_W + i] = TileId(55)
+
+    return tiles
+
+
+def _make_entities(rng: random.Random, count: int) -> list[Entity]:
+    entities = []
+
+    for _ in range(count):
+        size = rng.choice([(8, 8), (16, 16)])
+        comps = [
+            Position(rng.uniform(0, MAP_W - 2), rng.uniform(0, MAP_H - 2)),
+            Velocity(rng.uniform(-10, 10), 0),
+            Size(*size),
+        ]
+
+        if rng.random() < 0.5:
+            comps.append(Collider(area=pygame.Rect(2, 0, size[0] - 4, size[1])))
+
+        entities.append(Entity(comps))
+
+    return entities
+
+
+def _run(entities: EntityList, tiles: list[TileId]) -> float:
+    solid = solid_tiles(tiles, MAP_W, MAP_H)
+
+    start = time.perf_counter()
+
+    for _ in range(STEPS):
+        gravity(entities)
+        update_physics(
+            entities, DT,
+            tile_size=TILE_SIZE, tiles=tiles,
+            map_w=MAP_W, map_h=MAP_H, solid=solid,
+        )
+
+    return (time.perf_counter() - start) / STEPS
+
+
+def _state(entities: EntityList) -> list[tuple[float, ...]]:
+    return [
+        (pos.x, pos.y, vel.x, vel.y)
+        for pos, vel in entities.query(Position, Velocity).types()
+    ]
+
+
+def main():
+    tiles = _make_tiles(random.Random(0))
+
+    print(f"{'entities':>10} {'per-entity':>14} {'batch':>14} {'speedup':>8}")
+
+    for count in (10, 1_000, 10_000):
+        scalar = EntityList(_make_entities(random.Random(count), count))
+        batch = EntityList(
+            _make_entities(random.Random(count), count),
+            columns=ColumnStore(Position, Velocity, Size, Collider, capacity=count),
+        )
+
+        t_scalar = _run(scalar, tiles)
+        t_batch = _run(batch, tiles)
+
+        if _state(scalar) != _state(batch):
+            raise RuntimeError(f"results differ with {count} entities")
+
+        print(f"{count:>10} {t_scalar * 1000:>11.3f} ms {t_batch * 1000:>11.3f} ms {t_scalar / t_batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
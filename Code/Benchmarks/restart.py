@@ -0,0 +1,109 @@
+"""
+    Compares restarting a level by loading its map again, as Level used to,
+    with restoring its objects from the copy kept after the first load,
+    both by adding a copy of every object to a new list one by one (re-add)
+    and by copying the list's structures as they are (restore), as EntityList.clone does.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.restart
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import pygame
+
+from Source.column_store import ColumnStore
+from Source.components import *
+from Source.entity_list import EntityList
+from Source.image_cache import ImageCache
+from Source.scenes.level import parse
+from Source.systems.physics import solid_tiles
+from Source.systems.player import Powerup
+from Source.tile_chunks import TileChunks
+from Source.tilemap import TileMap
+
+
+COPIES = [1, 25, 250]  # how many times the objects of level 1 are repeated
+RUNS = 20
+
+
+def _reload(path: str, images: ImageCache) -> TileMap:
+    """
+    What every restart used to do.
+    """
+    tilemap = TileMap.load(path, images, parse)
+    tilemap.objects.attach(ColumnStore(Position, Velocity, Size, Collider))
+
+    solid_tiles(tilemap.tiles, tilemap.width, tilemap.height, tilemap.tileset.flags)
+    TileChunks(tilemap, images)
+
+    for obj in tilemap.objects.all():
+        obj.add(Velocity(0, 0))
+        obj.add(Active())
+
+    for _, size in tilemap.objects.query(Powerup, Size).types():
+        size.w *= 0.5
+        size.h *= 0.5
+
+    return tilemap
+
+
+def _readd(objects: EntityList) -> EntityList:
+    """
+    Copies the objects by adding a copy of each to a new list, with the queries of the original.
+    """
+    clone = EntityList(columns=ColumnStore(*objects.columns.kinds))  # type: ignore
+
+    for entity in objects.entities:
+        clone.add(entity.clone())
+
+    for sig in objects._archetypes:
+        clone._track(sig)
+
+    return clone
+
+
+def _time(run) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        run()
+    return (time.perf_counter() - start) / RUNS
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+
+    with open("./Resources/Maps/level1.json", "r") as f:
+        base = json.load(f)
+
+    images = ImageCache()
+
+    print(f"{'objects':>8} {'reload':>10} {'re-add':>10} {'restore':>10} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for copies in COPIES:
+            data = dict(base)
+            data["objects"] = base["objects"] * copies
+
+            path = os.path.join(folder, f"{copies}.json")
+            with open(path, "w") as f:
+                json.dump(data, f)
+
+            pristine = _reload(path, images).objects.clone()
+
+            t_reload = _time(lambda: _reload(path, images))
+            t_readd = _time(lambda: _readd(pristine))
+            t_restore = _time(pristine.clone)
+
+            print(f"{len(data['objects']):>8} {t_reload * 1000:>7.2f} ms {t_readd * 1000:>7.2f} ms "
+                  f"{t_restore * 1000:>7.3f} ms {t_reload / t_restore:>7.0f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
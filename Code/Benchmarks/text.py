@@ -0,0 +1,70 @@
+"""
+    Compares three ways of drawing the HUD strings with the ARCADECLASSIC fonts:
+    rasterizing them with the font every frame, reusing them from the text cache,
+    and composing them from a glyph atlas with one `blits` call, as ui.Context does.
+
+    Run from the `Code` folder:
+        python -m Benchmarks.text
+"""
+
+import time
+
+import pygame
+
+from Source.font_cache import FontCache
+from Source.glyph_atlas import GlyphAtlas
+from Source.text_cache import TextCache
+
+
+SIZES = [24, 48, 72, 96]
+BLACK = pygame.Color(0, 0, 0)
+FRAMES = 1000
+
+
+def _time(draw, strings: list[str]) -> float:
+    """
+    Returns the average time to draw the strings once, in microseconds.
+    """
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        draw(strings[i % len(strings)])
+    return (time.perf_counter() - start) / FRAMES * 1e6
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    fonts = FontCache()
+    texts = TextCache(fonts)
+
+    # the level timer and lives counter, which change the most often
+    strings = [f"{t:>03}" for t in range(100)] + [f"x {n}" for n in range(10)]
+
+    print(f"{'size':>6} {'render':>10} {'cached':>10} {'atlas':>10}")
+
+    for size in SIZES:
+        uid = fonts.load("ARCADECLASSIC.TTF", size)
+        font = fonts.unsafe_get(uid)
+        atlas = GlyphAtlas(font)
+
+        def render(text: str):
+            screen.blit(font.render(text, False, BLACK), (10, 10))
+
+        def cached(text: str):
+            screen.blit(texts.render(uid, text, BLACK), (10, 10))
+
+        def composed(text: str):
+            screen.blits(atlas.layout(text, BLACK, (10, 10)), doreturn=False)
+
+        for text in strings:
+            texts.render(uid, text, BLACK)  # warm up
+        atlas.layout("", BLACK, (0, 0))
+
+        print(f"{size:>6} {_time(render, strings):>8.1f}us {_time(cached, strings):>8.1f}us {_time(composed, strings):>8.1f}us")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
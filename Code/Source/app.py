@@ -6,16 +6,17 @@ import pygame
 
 from Source.scene import Scene
 from Source.director import Director
+from Source.frame_limiter import FrameLimiter
 
 
 class _NullScene(Scene):
     def enter(self, assets, ui):
         pass
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         pass
 
-    def draw(self):
+    def draw(self, alpha: float):
         pass
 
 
@@ -27,6 +28,22 @@ class App:
     title: str = "Pygame App"
     window_size: tuple[int, int] = (800, 600)
     start_scene: Scene = _NullScene()
+    tick_rate: int = 60
+    """
+    Number of simulation updates per second. Every update advances the scenes by the same amount of time.
+    """
+    max_steps: int = 5
+    """
+    Maximum number of updates run in a single frame. Time beyond that is dropped, so a slow frame can't snowball.
+    """
+    fps: int = 60
+    """
+    Maximum number of frames drawn per second, 0 for unlimited.
+    """
+    idle_timeout: int = 250
+    """
+    While the scene is idle, how long in ms to wait for an event before redrawing anyway.
+    """
 
     def run(self):
         """
@@ -44,23 +61,75 @@ class App:
         director = Director()
         director.push(self.start_scene)
 
+        step = 1000 / self.tick_rate  # ms per update, kept exact so updates add up to real time
+
+        limiter = FrameLimiter(self.fps)
+
         last = pygame.time.get_ticks()
+        lag = step  # run one update before the first frame is drawn
+
+        shown: Scene | None = None  # the scene on screen, None when it must be fully redrawn
 
         while True:
-            for event in pygame.event.get():
+            idle = director.idle()
+
+            if idle:
+                # nothing is animating, sleep until something happens
+                events = [pygame.event.wait(self.idle_timeout)]
+                events += pygame.event.get()
+                limiter.reset()
+            else:
+                events = pygame.event.get()
+
+            for event in events:
                 if event.type == pygame.QUIT:
+                    director.ctx.loader.shutdown()
                     pygame.quit()
                     return
 
-                director.input(event)
+                if event.type == pygame.WINDOWEXPOSED:
+                    shown = None
 
-            screen.fill((255, 255, 255))
+                if event.type != pygame.NOEVENT:
+                    director.input(event)
 
             now = pygame.time.get_ticks()
-            dt = now - last
+            lag += now - last
             last = now
 
-            director.update(dt)
-            director.draw()
+            if idle:
+                # a single update is enough to react to the events
+                lag = step
+
+            steps = 0
+            while lag >= step and steps < self.max_steps:
+                director.update(step)
+                lag -= step
+                steps += 1
+
+            if lag >= step:
+                # too far behind, drop the time we couldn't simulate
+                lag %= step
+
+            scene = director.scenes[-1]
+
+            if director.dirty_rects() and scene is shown:
+                # only redraw what the widgets changed, if anything
+                rects = director.ctx.ui.damage()
+
+                if rects:
+                    screen.set_clip(rects[0].unionall(rects[1:]))
+                    screen.fill((255, 255, 255))
+                    director.draw(lag / step)
+                    screen.set_clip(None)
+
+                    pygame.display.update(rects)
+            else:
+                screen.fill((255, 255, 255))
+                director.draw(lag / step)
+
+                pygame.display.update()
+
+            shown = scene
 
-            pygame.display.update()
+            limiter.wait()
@@ -0,0 +1,211 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import threading
+from typing import Any, Callable
+
+import pygame
+
+from Source import wamap
+
+
+class AssetLoader:
+    """
+    Loads assets on a pool of background threads.
+    Every request returns a future, and asking for the same file twice returns the same future,
+    so an asset requested ahead of time is ready, or on its way, when it is actually needed.
+    Only decoding happens off the main thread, anything touching the display doesn't.
+    """
+
+    def __init__(self, workers: int = 4):
+        """
+        Creates a loader with the given number of threads.
+        """
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="assets")
+
+        self.futures: dict[tuple[str, str], Future] = {}
+        self.requested: list[Future] = []  # in request order, to report progress
+
+        # the requests whose owner keeps its own copy of the result, not preloaded anymore
+        self.released: set[tuple[str, str]] = set()
+
+        # files which are preloaded from another one instead, see `alias`
+        self.aliases: dict[str, str] = {}
+
+        self._lock = threading.Lock()
+        self._started: set[Future] = set()  # the requests a thread is loading
+
+    def image(self, path: str) -> "Future[pygame.Surface]":
+        """
+        Decodes the image at the given path. The surface is shared, it must not be modified.
+        """
+        return self._request("image", path, pygame.image.load)
+
+    def json(self, path: str) -> Future:
+        """
+        Parses the JSON file at the given path. The result is shared, it must not be modified.
+        """
+        return self._request("json", path, _read_json)
+
+    def bytes(self, path: str) -> "Future[bytes]":
+        """
+        Reads the whole file at the given path, e.g. for fonts which can only be opened on the main thread.
+        """
+        return self._request("bytes", path, _read_bytes)
+
+    def map(self, path: str) -> Future:
+        """
+        Parses the map at the given path, JSON or compiled, and requests its tileset and images along the way.
+        """
+        return self._request("map", path, self._load_map)
+
+    def once(self, path: str, load: Callable[[str], Any]) -> Future:
+        """
+        Runs `load` on the given path in the background, without keeping the result,
+        for data which is dropped once used.
+        """
+        return self.pool.submit(load, path)
+
+    def forget(self, path: str):
+        """
+        Drops everything loaded from the given path, so it is loaded again the next time, e.g. after it changed.
+        """
+        with self._lock:
+            for key in [key for key in self.futures if key[1] == path]:
+                del self.futures[key]
+
+            self.released = {key for key in self.released if key[1] != path}
+
+    def alias(self, path: str, target: str):
+        """
+        Preloads `target` in place of the file at `path`, e.g. the atlas page an image is packed in.
+        """
+        self.aliases[path] = target
+
+    def release(self, kind: str, path: str):
+        """
+        Drops the result of a request once its owner has its own copy, e.g. a converted image.
+        It isn't preloaded again, and requesting it again loads it again.
+        """
+        with self._lock:
+            self.futures.pop((kind, path), None)
+            self.released.add((kind, path))
+
+    def finish(self):
+        """
+        Stops reporting the progress of the requests made so far, once they are loaded,
+        so the list doesn't keep their results alive.
+        """
+        with self._lock:
+            self.requested.clear()
+
+    def progress(self, start: int = 0) -> tuple[int, int]:
+        """
+        Returns how many of the assets requested since the `start`-th request are loaded, out of how many.
+        """
+        with self._lock:
+            futures = self.requested[start:]
+
+        return sum(future.done() for future in futures), len(futures)
+
+    def shutdown(self):
+        """
+        Stops the threads once the pending requests are done.
+        """
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _request(self, kind: str, path: str, load: Callable[[str], Any]) -> Future:
+        key = (kind, path)
+
+        with self._lock:
+            future = self.futures.get(key)
+
+            if future is None:
+                future = Future()
+                self.futures[key] = future
+                self.requested.append(future)
+                self.pool.submit(self._run, future, load, path)
+
+        return future
+
+    def _preload(self, kind: str, path: str, load: Callable[[str], Any]):
+        """
+        Requests the file, or the one it is an alias of, unless its result was released.
+        """
+        path = self.aliases.get(path, path)
+
+        if (kind, path) not in self.released:
+            self._request(kind, path, load)
+
+    def _run(self, future: Future, load: Callable[[str], Any], path: str):
+        # it might have been loaded inline by `_resolve` already
+        if self._claim(future):
+            self._fulfil(future, load, path)
+
+    def _claim(self, future: Future) -> bool:
+        """
+        Returns True if the caller is the first to load the request, and must fulfil its future.
+        """
+        with self._lock:
+            if future in self._started or future.done():
+                return False
+
+            self._started.add(future)
+            return True
+
+    def _fulfil(self, future: Future, load: Callable[[str], Any], path: str):
+        try:
+            future.set_result(load(path))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._started.discard(future)
+
+    def _load_map(self, path: str) -> Any:
+        # the files are read here rather than waited on, a worker waiting
+        # for another request could starve the pool
+        if path.endswith(".wamap"):
+            data = wamap.read(path)
+        else:
+            data = self._resolve("json", path, _read_json)
+
+        if data.get("background") is not None:
+            self._preload("image", "Resources/Images/" + data["background"], pygame.image.load)
+
+        for obj in data.get("objects", []):
+            self._preload("image", "Resources/Images/" + obj["image"], pygame.image.load)
+
+        ts = self._resolve("json", "./Resources/Maps/" + data["tileset"], _read_json)
+        self._preload("image", "Resources/Images/" + ts["image"], pygame.image.load)
+
+        return data
+
+    def _resolve(self, kind: str, path: str, load: Callable[[str], Any]) -> Any:
+        """
+        Loads the file on the current thread, unless another thread already is, and stores it as requested.
+        Waiting is only ever done on a thread that is loading, never on a queued request,
+        which could starve the pool.
+        """
+        key = (kind, path)
+
+        with self._lock:
+            future = self.futures.get(key)
+
+            if future is None:
+                future = Future()
+                self.futures[key] = future
+
+        if self._claim(future):
+            self._fulfil(future, load, path)
+
+        return future.result()
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
@@ -2,11 +2,20 @@
 import pygame
 
 
+_Item = tuple[int, pygame.Surface, tuple[int, int], pygame.Rect | None]
+"""
+A queued render: layer, image, destination in world coordinates and area of the image.
+"""
+
+
 class Camera:
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
         self.area = screen.get_rect()
 
+        # renders submitted since the last flush
+        self.queue: list[_Item] = []
+
     def visible(self, area: pygame.Rect) -> bool:
         return self.area.colliderect(area)
 
@@ -32,3 +41,37 @@ class Camera:
                 dst.move(-self.area.x, -self.area.y),
                 area,
             )
+
+    def submit(self, image: pygame.Surface, dst: tuple[int, int] = (0, 0),
+               area: pygame.Rect | None = None, layer: int = 0):
+        """
+        Queues an image to be rendered by the next `flush`.
+        Lower layers are drawn first, images of a layer in the order they were submitted.
+        """
+        self.queue.append((layer, image, dst, area))
+
+    def flush(self):
+        """
+        Renders the queued images with a single `blits` call, skipping the ones that are not visible.
+        """
+        if not self.queue:
+            return
+
+        x, y = self.area.topleft
+
+        bounds = [
+            pygame.Rect(dst, area.size if area is not None else image.get_size())
+            for _, image, dst, area in self.queue
+        ]
+        visible = [self.queue[i] for i in self.area.collidelistall(bounds)]
+
+        # the sort is stable, so overlapping images of a layer keep their submission order
+        visible.sort(key=lambda item: item[0])
+
+        self.screen.blits(
+            [(image, (dst[0] - x, dst[1] - y), area)
+             for _, image, dst, area in visible],
+            doreturn=False,
+        )
+
+        self.queue.clear()
@@ -0,0 +1,225 @@
+from typing import Type
+
+import numpy as np
+
+from Source.entity import Component, Entity
+
+
+class ColumnField:
+    """
+    A float attribute of a column component.
+    It lives in the component itself until the component is bound to a column store,
+    after which it reads from and writes to the component's row in the store.
+    """
+
+    def __init__(self, axis: int):
+        self.axis = axis
+
+    def __get__(self, obj: "ColumnComponent | None", owner: type):
+        if obj is None:
+            return self
+
+        store = obj._store
+        if store is None:
+            return obj._values[self.axis]
+
+        return store.data[owner._cid].item(obj._slot, self.axis)
+
+    def __set__(self, obj: "ColumnComponent", value: float):
+        store = obj._store
+        if store is None:
+            obj._values[self.axis] = value
+        else:
+            store.data[type(obj)._cid][obj._slot, self.axis] = value
+
+
+class ColumnComponent(Component):
+    """
+    Base class for components made of a few floats, which can be stored in a ColumnStore.
+    Subclasses declare their fields as `ColumnField`s and list their names in `_fields`.
+    """
+
+    _fields: tuple[str, ...] = ()
+
+    def __init__(self, *values: float):
+        self._values = list(values)
+
+        # set while the component is a view into a column store
+        self._store: "ColumnStore | None" = None
+        self._slot = -1
+
+    def clone(self) -> "ColumnComponent":
+        comp = object.__new__(type(self))
+
+        if self._store is None:
+            comp._values = list(self._values)
+        else:
+            comp._values = self._store.data[type(self)._cid][self._slot].tolist()
+
+        comp._store = None
+        comp._slot = -1
+        return comp
+
+    def _view(self, store: "ColumnStore", slot: int) -> "ColumnComponent":
+        """
+        Returns a copy of the component which is a view into the given slot of the store,
+        where its values already are.
+        """
+        comp = object.__new__(type(self))
+        comp._values = []  # in the store
+        comp._store = store
+        comp._slot = slot
+        return comp
+
+    def _detach(self):
+        """
+        Copy the values back from the store and stop being a view into it.
+        """
+        if self._store is not None:
+            self._values = [getattr(self, f) for f in self._fields]
+            self._store = None
+            self._slot = -1
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{f}={getattr(self, f)}" for f in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    __hash__ = None  # type: ignore
+
+
+class ColumnStore:
+    """
+    Struct-of-arrays storage for column components.
+    Every entity gets a slot, and every stored component type gets a float array
+    with one row per slot, so systems can update all the entities at once.
+    """
+
+    def __init__(self, *kinds: Type[ColumnComponent], capacity: int = 64):
+        """
+        Creates a store for the given component types.
+        """
+        self.kinds = kinds
+        self.capacity = max(1, capacity)
+
+        # component id -> values, one row per slot
+        self.data: dict[int, np.ndarray] = {
+            k._cid: np.zeros((self.capacity, len(k._fields))) for k in kinds
+        }
+        # component id -> whether the entity in the slot has the component
+        self.present: dict[int, np.ndarray] = {
+            k._cid: np.zeros(self.capacity, dtype=bool) for k in kinds
+        }
+
+        self.slots: dict[Entity, int] = {}
+        self.free: list[int] = []
+        self.count = 0  # number of slots ever used
+
+    def stores(self, kind: type) -> bool:
+        """
+        Returns True if the given component type is kept in the store.
+        """
+        return kind._cid in self.data  # type: ignore
+
+    def insert(self, entity: Entity):
+        """
+        Gives the entity a slot and binds its stored components.
+        """
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = self.count
+            self.count += 1
+
+            if slot >= self.capacity:
+                self._grow()
+
+        self.slots[entity] = slot
+
+        for kind in self.kinds:
+            comp = entity.get(kind)
+            if comp is not None:
+                self.bind(entity, comp)
+
+    def erase(self, entity: Entity):
+        """
+        Unbinds the entity's stored components and releases its slot.
+        """
+        for kind in self.kinds:
+            comp = entity.get(kind)
+            if comp is not None:
+                self.unbind(entity, comp)
+
+        self.free.append(self.slots.pop(entity))
+
+    def bind(self, entity: Entity, comp: ColumnComponent, old: ColumnComponent | None = None):
+        """
+        Makes the component a view into the entity's row, replacing `old` if given.
+        """
+        if old is not None:
+            old._detach()
+
+        # the component might belong to another entity row
+        comp._detach()
+
+        cid = type(comp)._cid
+        slot = self.slots[entity]
+
+        self.data[cid][slot] = comp._values
+        self.present[cid][slot] = True
+
+        comp._store = self
+        comp._slot = slot
+
+    def unbind(self, entity: Entity, comp: ColumnComponent):
+        """
+        Copies the component's values out of the store and clears its row.
+        """
+        comp._detach()
+        self.present[type(comp)._cid][self.slots[entity]] = False
+
+    def clone(self) -> "ColumnStore":
+        """
+        Returns a copy of the store's arrays, with the same slots used but no entity in them yet.
+        See EntityList.clone, which gives the slots to the copies of the entities.
+        """
+        store = ColumnStore.__new__(ColumnStore)
+        store.kinds = self.kinds
+        store.capacity = self.capacity
+
+        store.data = {cid: values.copy() for cid, values in self.data.items()}
+        store.present = {cid: present.copy() for cid, present in self.present.items()}
+
+        store.slots = {}
+        store.free = list(self.free)
+        store.count = self.count
+
+        return store
+
+    def column(self, kind: Type[ColumnComponent]) -> np.ndarray:
+        """
+        Returns the values of the given component type for every used slot.
+        """
+        return self.data[kind._cid][:self.count]
+
+    def mask(self, *kinds: Type[ColumnComponent]) -> np.ndarray:
+        """
+        Returns which of the used slots have all of the given component types.
+        """
+        mask = self.present[kinds[0]._cid][:self.count]
+        for k in kinds[1:]:
+            mask = mask & self.present[k._cid][:self.count]
+        return mask
+
+    def _grow(self):
+        self.capacity *= 2
+
+        for cid, values in self.data.items():
+            self.data[cid] = np.concatenate((values, np.zeros_like(values)))
+
+        for cid, present in self.present.items():
+            self.present[cid] = np.concatenate((present, np.zeros_like(present)))
@@ -2,26 +2,39 @@
 from dataclasses import dataclass
 from pygame import Rect
 
+from Source.column_store import ColumnComponent, ColumnField
 from Source.entity import Component
 from Source.image_cache import TextureId
 
 
-@dataclass
-class Position(Component):
-    x: float = 0
-    y: float = 0
+class Position(ColumnComponent):
+    x = ColumnField(0)
+    y = ColumnField(1)
 
+    _fields = ("x", "y")
 
-@dataclass
-class Velocity(Component):
-    x: float = 0
-    y: float = 0
+    def __init__(self, x: float = 0, y: float = 0):
+        super().__init__(x, y)
 
 
-@dataclass
-class Size(Component):
-    w: int = 0
-    h: int = 0
+class Velocity(ColumnComponent):
+    x = ColumnField(0)
+    y = ColumnField(1)
+
+    _fields = ("x", "y")
+
+    def __init__(self, x: float = 0, y: float = 0):
+        super().__init__(x, y)
+
+
+class Size(ColumnComponent):
+    w = ColumnField(0)
+    h = ColumnField(1)
+
+    _fields = ("w", "h")
+
+    def __init__(self, w: int = 0, h: int = 0):
+        super().__init__(w, h)
 
 
 @dataclass
@@ -30,6 +43,10 @@ class Sprite(Component):
     uid: TextureId = TextureId(-1)  # the id of the sprite in the ImageCache
     flip: bool = False
 
+    def clone(self) -> "Sprite":
+        # the animations move the rect
+        return Sprite(Rect(self.rect), self.uid, self.flip)
+
 
 @dataclass
 class Name(Component):
@@ -54,7 +71,7 @@ class Animation:
 class Animator(Component):
     anims: dict[str, Animation]
     active: str
-    elapsed: int = 0
+    elapsed: float = 0
 
     def __init__(self, anims: dict[str, Animation], active: str):
         self.anims = anims
@@ -65,6 +82,20 @@ class Animator(Component):
         self.active = name
 
 
-@dataclass
-class Collider(Component):
-    area: Rect
+class Collider(ColumnComponent):
+    x = ColumnField(0)
+    y = ColumnField(1)
+    w = ColumnField(2)
+    h = ColumnField(3)
+
+    _fields = ("x", "y", "w", "h")
+
+    def __init__(self, area: Rect):
+        super().__init__(area.x, area.y, area.w, area.h)
+
+    @property
+    def area(self) -> Rect:
+        """
+        The collider's area, relative to the entity. Changing the returned rect has no effect.
+        """
+        return Rect(self.x, self.y, self.w, self.h)
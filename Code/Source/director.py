@@ -11,38 +11,74 @@ from Source.scene_context import SceneContext
 class Director:
     def __init__(self):
         self.scenes: list[Scene] = []
+        self.backdrops: list[pygame.Surface | None] = []  # what is drawn under each scene
 
         self.ctx = SceneContext()
 
     def push(self, scene: Scene):
+        backdrop = None
+
         if len(self.scenes) > 0:
             self.scenes[-1].exit()
 
+            overlay = scene.overlay()
+            if overlay is not None:
+                # the scene below is frozen as it was last drawn
+                backdrop = overlay.backdrop(self.ctx.camera.screen.copy()).convert()
+
         self.scenes.append(scene)
+        self.backdrops.append(backdrop)
         self.scenes[-1].enter(self.ctx)
 
+        # the widgets of the previous scene shouldn't be drawn over this one
+        self.ctx.ui.begin()
+
+    def replace(self, scene: Scene):
+        self.scenes[-1].exit()
+
+        self.scenes[-1] = scene
+        self.backdrops[-1] = None
+
+        scene.enter(self.ctx)
+        self.ctx.ui.begin()
+
     def pop(self):
         self.scenes[-1].exit()
         self.scenes.pop()
+        self.backdrops.pop()
 
         if len(self.scenes) == 0:
+            self.ctx.loader.shutdown()
             pygame.quit()
             sys.exit(0)
 
         self.scenes[-1].enter(self.ctx)
+        self.ctx.ui.begin()
 
     def input(self, event: event.Event):
         cmd = self.scenes[-1].input(event)
         if isinstance(cmd, Scene.Push):
             self.push(cmd.scene)
+        elif isinstance(cmd, Scene.Replace):
+            self.replace(cmd.scene)
         elif isinstance(cmd, Scene.Pop):
             self.pop()
         elif isinstance(cmd, Scene.PopAll):
             while len(self.scenes) > 0:
                 self.pop()
 
-    def update(self, dt: int):
+    def idle(self) -> bool:
+        return self.scenes[-1].idle()
+
+    def dirty_rects(self) -> bool:
+        return self.scenes[-1].dirty_rects()
+
+    def update(self, dt: float):
+        self.ctx.ui.begin()
         self.scenes[-1].update(dt)
 
-    def draw(self):
-        self.scenes[-1].draw()
+    def draw(self, alpha: float):
+        if self.backdrops[-1] is not None:
+            self.ctx.camera.screen.blit(self.backdrops[-1], (0, 0))
+
+        self.scenes[-1].draw(alpha)
@@ -1,14 +1,67 @@
+from typing import TYPE_CHECKING, Iterable, Type, TypeVar, cast
 
-from typing import Iterable, Type, TypeVar, cast
+if TYPE_CHECKING:
+    from Source.column_store import ColumnStore
+    from Source.entity_list import EntityList
 
 
 class Component:
     """Base class for all components."""
-    pass
+
+    _cid = -1
+    """
+    The id of the component type, assigned when the subclass is defined.
+    """
+
+    _bit = 0
+    """
+    The bit of the component type in an entity's signature, i.e. `1 << _cid`.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        cls._cid = len(_registry)
+        cls._bit = 1 << cls._cid
+        _registry.append(cls)
+
+    def clone(self) -> "Component":
+        """
+        Returns a copy of the component, to give to another entity.
+        Shallow by default, components holding mutable values must copy them.
+        Markers, which hold nothing, are shared rather than copied.
+        """
+        if not self.__dict__:
+            return self
+
+        comp = object.__new__(type(self))
+        comp.__dict__ = self.__dict__.copy()
+        return comp
 
 
+_registry: list[Type[Component]] = []
+"""
+Every component type, indexed by its id.
+"""
+
 _Comp = TypeVar("_Comp", bound=Component)
 
+_signatures: dict[tuple, int] = {}
+
+
+def signature(kinds: tuple) -> int:
+    """
+    Returns the bitmask of the given component types.
+    """
+    mask = _signatures.get(kinds)
+    if mask is None:
+        mask = 0
+        for k in kinds:
+            mask |= k._bit
+        _signatures[kinds] = mask
+
+    return mask
+
 
 class Entity:
     """
@@ -19,34 +72,91 @@ class Entity:
         """
         Create a new entity with the given components.
         """
-        self.components = {type(c).__name__: c for c in comps}
+        # components indexed by their type id, and the bitmask of the ones present
+        self.components: list[Component | None] = []
+        self.mask = 0
+
+        # the lists that contain this entity, notified when its components change
+        self._lists: list["EntityList"] = []
+
+        for c in comps:
+            self._set(c)
+
+    def clone(self, store: "ColumnStore | None" = None, slot: int = -1) -> "Entity":
+        """
+        Returns a new entity with a copy of every component, which belongs to no list.
+        With a `store`, the components it keeps are views into the given slot of it,
+        which must already hold their values.
+        """
+        entity = Entity()
+
+        if store is None:
+            entity.components = [c.clone() if c is not None else None for c in self.components]
+        else:
+            entity.components = [
+                None if c is None else c._view(store, slot) if store.stores(type(c)) else c.clone()  # type: ignore
+                for c in self.components
+            ]
+
+        entity.mask = self.mask
+        return entity
 
     def get(self, kind: Type[_Comp]) -> _Comp | None:
         """
         Get a component of the given type. Returns None if the entity does not have the component.
         """
-        return cast(_Comp | None, self.components.get(kind.__name__))
+        if self.mask & kind._bit:
+            return cast(_Comp, self.components[kind._cid])
+        return None
 
     def unsafe_get(self, kind: Type[_Comp]) -> _Comp:
         """
         Get a component of the given type. Raises KeyError if the entity does not have the component.
         """
-        return cast(_Comp, self.components[kind.__name__])
+        if not self.mask & kind._bit:
+            raise KeyError(kind.__name__)
+        return cast(_Comp, self.components[kind._cid])
 
     def add(self, value: Component):
         """
         Add a component to the entity. If the entity already has a component of the same type, it will be replaced.
         """
-        self.components.update({type(value).__name__: value})
+        kind = type(value)
+        old = self.components[kind._cid] if self.mask & kind._bit else None
+
+        self._set(value)
+
+        for entities in self._lists:
+            entities._component_added(self, value, old)
 
     def has(self, kind: tuple | Type[_Comp]) -> bool:
         """
         Check if the entity has a component of the given type.
         """
         if isinstance(kind, tuple):
-            return all(k.__name__ in self.components for k in kind)
+            mask = signature(kind)
+            return self.mask & mask == mask
         else:
-            return kind.__name__ in self.components
+            return self.mask & kind._bit != 0
 
     def remove(self, kind: Type[_Comp]):
-        self.components.pop(kind.__name__, None)
+        """
+        Remove the component of the given type from the entity, if it has one.
+        """
+        if self.mask & kind._bit:
+            value = cast(Component, self.components[kind._cid])
+
+            self.mask &= ~kind._bit
+            self.components[kind._cid] = None
+
+            for entities in self._lists:
+                entities._component_removed(self, value)
+
+    def _set(self, value: Component):
+        cid = type(value)._cid
+
+        if cid >= len(self.components):
+            self.components.extend([None] * (cid + 1 - len(self.components)))
+
+        self.components[cid] = value
+        self.mask |= type(value)._bit
@@ -1,42 +1,179 @@
-
+import gc
 from typing import Iterable, Type
-from Source.entity import Entity, _Comp
+
+from Source.column_store import ColumnStore
+from Source.entity import Component, Entity, _Comp, signature
 
 
 class _TypeIter:
     def __init__(self, entities: Iterable[Entity], *fs: Type[_Comp]):
-        self.entities = entities
+        # take a snapshot so systems can add/remove components while iterating,
+        # the entities which stop matching during the iteration are skipped
+        self.entities = tuple(entities)
         self.filters = fs
+        self.sig = signature(fs)
 
     def ids(self):
+        sig = self.sig
         for entity in self.entities:
-            if entity.has(self.filters):
+            if entity.mask & sig == sig:
                 yield entity
 
     def types(self):
+        sig = self.sig
         if len(self.filters) == 1:
+            cid = self.filters[0]._cid
             for entity in self.entities:
-                if entity.has(self.filters):
-                    yield entity.unsafe_get(self.filters[0])
+                if entity.mask & sig == sig:
+                    yield entity.components[cid]
         else:
+            cids = [c._cid for c in self.filters]
             for entity in self.entities:
-                if entity.has(self.filters):
-                    yield tuple(entity.unsafe_get(c) for c in self.filters)
+                if entity.mask & sig == sig:
+                    comps = entity.components
+                    yield tuple(comps[cid] for cid in cids)
 
 
 class EntityList:
-    def __init__(self, entities: Iterable[Entity] = ()):
-        self.entities = list(entities)
+    def __init__(self, entities: Iterable[Entity] = (), columns: ColumnStore | None = None):
+        self.entities: list[Entity] = []
+
+        # optional struct-of-arrays storage for the entities' column components
+        self.columns = columns
+
+        # query cache: for every signature that has been queried so far,
+        # the (insertion ordered) set of entities that match it.
+        # The sets are kept up to date as entities and components come and go,
+        # so a query only costs as much as the number of entities it returns.
+        self._archetypes: dict[int, dict[Entity, None]] = {}
+        # component id -> signatures that contain it
+        self._by_component: dict[int, list[int]] = {}
+
+        for entity in entities:
+            self.add(entity)
 
     def add(self, entity: Entity):
         self.entities.append(entity)
+        entity._lists.append(self)
+
+        if self.columns is not None:
+            self.columns.insert(entity)
+
+        for sig, members in self._archetypes.items():
+            if entity.mask & sig == sig:
+                members[entity] = None
 
     def remove(self, entity: Entity):
         self.entities.remove(entity)
+        entity._lists.remove(self)
+
+        if self.columns is not None:
+            self.columns.erase(entity)
+
+        for members in self._archetypes.values():
+            members.pop(entity, None)
+
+    def attach(self, columns: ColumnStore):
+        """
+        Moves the column components of every entity into the given store.
+        """
+        if self.columns is not None:
+            for entity in self.entities:
+                self.columns.erase(entity)
+
+        self.columns = columns
+
+        for entity in self.entities:
+            columns.insert(entity)
+
+    def clone(self) -> "EntityList":
+        """
+        Returns a new list with a copy of every entity, and a copy of the column store if any.
+        The store's arrays and the query caches are copied as they are, the copies taking
+        the place of the originals, rather than rebuilt by adding the copies one by one.
+        """
+        clone = EntityList()
+        copies: dict[Entity, Entity] = {}
+
+        # every copy is kept, the garbage collector would only scan them over and over as they are made
+        collecting = gc.isenabled()
+        gc.disable()
+
+        try:
+            if self.columns is None:
+                for entity in self.entities:
+                    copy = copies[entity] = entity.clone()
+                    copy._lists.append(clone)
+            else:
+                store = clone.columns = self.columns.clone()
+                slots = self.columns.slots
+
+                for entity in self.entities:
+                    copy = copies[entity] = entity.clone(store, slots[entity])
+                    copy._lists.append(clone)
+
+                store.slots = {copies[entity]: slot for entity, slot in slots.items()}
+        finally:
+            if collecting:
+                gc.enable()
+
+        clone.entities = list(copies.values())
+
+        clone._archetypes = {
+            sig: {copies[entity]: None for entity in members} for sig, members in self._archetypes.items()
+        }
+        clone._by_component = {cid: list(sigs) for cid, sigs in self._by_component.items()}
+
+        return clone
 
     def all(self):
         for entity in self.entities:
             yield entity
 
     def query(self, *cls: Type[_Comp]):
-        return _TypeIter(self.entities, *cls)  # type: ignore
+        sig = signature(cls)
+
+        members = self._archetypes.get(sig)
+        if members is None:
+            members = self._track(sig)
+
+        return _TypeIter(members, *cls)  # type: ignore
+
+    def _track(self, sig: int) -> dict[Entity, None]:
+        """
+        Start caching the entities that match the given signature.
+        """
+        members = {
+            entity: None for entity in self.entities if entity.mask & sig == sig
+        }
+
+        self._archetypes[sig] = members
+
+        cid = 0
+        bits = sig
+        while bits:
+            if bits & 1:
+                self._by_component.setdefault(cid, []).append(sig)
+            bits >>= 1
+            cid += 1
+
+        return members
+
+    def _component_added(self, entity: Entity, value: Component, old: Component | None):
+        if self.columns is not None and self.columns.stores(type(value)):
+            self.columns.bind(entity, value, old)  # type: ignore
+
+        if old is not None:
+            # replaced, the entity still matches the same signatures
+            return
+
+        for sig in self._by_component.get(type(value)._cid, ()):
+            if entity.mask & sig == sig:
+                self._archetypes[sig][entity] = None
+
+    def _component_removed(self, entity: Entity, value: Component):
+        if self.columns is not None and self.columns.stores(type(value)):
+            self.columns.unbind(entity, value)  # type: ignore
+
+        for sig in self._by_component.get(type(value)._cid, ()):
+            self._archetypes[sig].pop(entity, None)
@@ -1,8 +1,11 @@
 
+import io
 from typing import NewType, cast
 
 import pygame
 
+from Source.asset_loader import AssetLoader
+
 FontId = NewType("FontId", int)
 
 
@@ -11,12 +14,15 @@ class FontCache:
     A class that manages the lifetime of fonts.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, loader: AssetLoader | None = None) -> None:
         """
         Creates a new font cache.
+        With a `loader`, font files requested ahead of time are read in the background.
         """
         pygame.font.init()
 
+        self.loader = loader
+
         self.ids: dict[str, int] = {}
         self.fonts: list[pygame.font.Font | None] = []
 
@@ -41,8 +47,14 @@ class FontCache:
         name = f"{path}-{size}"
         if path not in self.ids:
             self.ids[name] = len(self.fonts)
-            self.fonts.append(pygame.font.Font(
-                "./Resources/Fonts/" + path, size))
+
+            if self.loader is None:
+                file = "./Resources/Fonts/" + path
+            else:
+                # fonts must be opened on the main thread, only the file is read by the loader
+                file = io.BytesIO(self.loader.bytes("./Resources/Fonts/" + path).result())
+
+            self.fonts.append(pygame.font.Font(file, size))
 
         return FontId(self.ids[name])
 
@@ -0,0 +1,49 @@
+import time
+
+
+class FrameLimiter:
+    """
+    Keeps the main loop from running faster than a target frame rate.
+    It sleeps for most of the remaining frame time, then spins for the last bit,
+    since sleeping alone can overshoot by a few milliseconds.
+    """
+
+    def __init__(self, fps: int, spin: float = 0.002):
+        """
+        Creates a limiter for the given frame rate, 0 meaning unlimited.
+        `spin` is how many seconds before the deadline to stop sleeping and start spinning.
+        """
+        self.fps = fps
+        self.spin = spin
+
+        self.deadline = time.perf_counter()
+
+    def reset(self):
+        """
+        Starts counting the next frame from now, e.g. after the loop was blocked.
+        """
+        self.deadline = time.perf_counter()
+
+    def wait(self):
+        """
+        Waits until the end of the current frame.
+        """
+        if self.fps <= 0:
+            return
+
+        period = 1 / self.fps
+        now = time.perf_counter()
+
+        self.deadline += period
+
+        if self.deadline < now - period:
+            # too far behind, don't rush frames to catch up
+            self.deadline = now
+            return
+
+        remaining = self.deadline - now
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+
+        while time.perf_counter() < self.deadline:
+            pass
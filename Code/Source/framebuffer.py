@@ -0,0 +1,57 @@
+import pygame
+
+
+class Framebuffer:
+    """
+    An offscreen surface at the game's native resolution.
+    Everything is drawn to it unscaled, then it is upscaled to the window in one go.
+    """
+
+    def __init__(self, size: tuple[int, int], screen: pygame.Surface,
+                 scale2x: bool = False, colorkey: tuple[int, int, int] | None = None):
+        """
+        Creates a framebuffer of the given size, in the same pixel format as the screen.
+        With `scale2x`, it is first doubled with the Scale2x algorithm, which smooths diagonal edges.
+        With a `colorkey`, the pixels left in that color let what is already on the screen show through.
+        """
+        self.surface = pygame.Surface(size, 0, screen)
+        self.scale2x = scale2x
+        self.colorkey = colorkey
+
+        self.doubled = pygame.Surface((size[0] * 2, size[1] * 2), 0, screen) if scale2x else None
+        self.scaled: pygame.Surface | None = None  # the upscaled frame, if it can't go straight to the screen
+
+    def clear(self):
+        """
+        Fills the framebuffer with its colorkey, or black.
+        """
+        self.surface.fill(self.colorkey or (0, 0, 0))
+
+    def present(self, screen: pygame.Surface, scale: float | None = None):
+        """
+        Upscales the framebuffer `scale` times onto the screen, from its top left corner,
+        or to cover the whole screen without a `scale`.
+        """
+        src = self.surface
+
+        if scale is None:
+            size = screen.get_size()
+        else:
+            size = (round(src.get_width() * scale), round(src.get_height() * scale))
+
+        if self.doubled is not None:
+            pygame.transform.scale2x(src, self.doubled)
+            src = self.doubled
+
+        if self.colorkey is None and size == screen.get_size():
+            pygame.transform.scale(src, size, screen)
+            return
+
+        if self.scaled is None or self.scaled.get_size() != size:
+            self.scaled = pygame.Surface(size, 0, screen)
+
+            if self.colorkey is not None:
+                self.scaled.set_colorkey(self.colorkey)
+
+        pygame.transform.scale(src, size, self.scaled)
+        screen.blit(self.scaled, (0, 0))
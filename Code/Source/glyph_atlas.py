@@ -0,0 +1,95 @@
+import pygame
+
+
+CHARS = "".join(chr(c) for c in range(32, 127))
+"""
+The characters an atlas holds, printable ASCII.
+"""
+
+_Blit = tuple[pygame.Surface, tuple[int, int], pygame.Rect]
+
+
+class GlyphAtlas:
+    """
+    The glyphs of a font, rendered once per color side by side on a colorkeyed page,
+    so strings are drawn glyph by glyph with a single `blits` call instead of being rasterized.
+    Glyphs are placed the way SDL_ttf places them: a string looks as `font.render` draws it
+    without antialiasing, which suits bitmap fonts like ARCADECLASSIC.
+    """
+
+    def __init__(self, font: pygame.font.Font):
+        """
+        Creates an atlas for the given font, with no page rendered yet.
+        """
+        self.font = font
+
+        # character -> (offset from the pen, advance)
+        self.metrics: dict[str, tuple[int, int]] = {
+            char: (min(m[0], 0), m[4]) for char, m in zip(CHARS, font.metrics(CHARS))
+        }
+
+        # color -> the page, and for every character its area on it, offset and advance
+        self.pages: dict[tuple[int, int, int, int], tuple[pygame.Surface, dict[str, tuple[pygame.Rect, int, int]]]] = {}
+
+    def covers(self, text: str) -> bool:
+        """
+        Returns True if every character of the text is in the atlas.
+        """
+        return all(char in self.metrics for char in text)
+
+    def size(self, text: str) -> tuple[int, int]:
+        """
+        Returns the size of the text, as `font.render` would make it.
+        """
+        return self.font.size(text)
+
+    def layout(self, text: str, color: pygame.Color, pos: tuple[int, int]) -> list[_Blit]:
+        """
+        Returns the blits drawing the text at the given position, for `Surface.blits`.
+        The text must be covered by the atlas.
+        """
+        page, glyphs = self._page(color)
+
+        # a first glyph hanging to the left moves the whole string right
+        x, y = pos
+        if text:
+            x -= self.metrics[text[0]][0]
+
+        blits = []
+
+        for char in text:
+            area, offset, advance = glyphs[char]
+            blits.append((page, (x + offset, y), area))
+            x += advance
+
+        return blits
+
+    def _page(self, color: pygame.Color) -> tuple[pygame.Surface, dict[str, tuple[pygame.Rect, int, int]]]:
+        key = tuple(color)
+
+        page = self.pages.get(key)  # type: ignore
+        if page is not None:
+            return page
+
+        glyphs = [self.font.render(char, False, color) for char in CHARS]
+
+        colorkey = (255, 0, 255) if key[:3] != (255, 0, 255) else (0, 255, 0)
+
+        surf = pygame.Surface((sum(g.get_width() for g in glyphs), max(g.get_height() for g in glyphs)))
+        surf.fill(colorkey)
+
+        placed = {}
+        x = 0
+
+        for char, glyph in zip(CHARS, glyphs):
+            surf.blit(glyph, (x, 0))
+            placed[char] = (pygame.Rect(x, 0, glyph.get_width(), glyph.get_height()), *self.metrics[char])
+            x += glyph.get_width()
+
+        # no RLEACCEL, blitting parts of an RLE surface has to skip through every row before them
+        surf.set_colorkey(colorkey)
+
+        page = (surf.convert(), placed)
+        self.pages[key] = page  # type: ignore
+
+        return page
@@ -1,34 +1,112 @@
 
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+import json
 from typing import NewType, cast
 
 import pygame
 
+from Source.asset_loader import AssetLoader
+
 TextureId = NewType("TextureId", int)
 """
 Type safe representation of a texture id.
 """
 
+_Variant = tuple[TextureId, tuple[int, int, int, int] | None, tuple[int, int] | None, bool]
+"""
+A transformed texture: the texture id, crop rect, target size and horizontal flip.
+"""
+
+
+@dataclass
+class _Region:
+    """
+    Where an image packed in an atlas is, see Tools/pack_atlas.py.
+    """
+    page: str
+    rect: tuple[int, int, int, int]
+    colorkey: tuple[int, int, int] | None = None  # already made transparent by the packer
+
 
 class ImageCache:
     """
     A class that manages the lifetime of images.
     """
 
-    def __init__(self):
+    def __init__(self, budget: int = 64 * 1024 * 1024, loader: AssetLoader | None = None,
+                 atlas: str | None = None):
         """
         Creates a new image cache.
+        `budget` is how many bytes the transformed textures may use, see `transformed`.
+        With a `loader`, images are decoded in the background, see `load`.
+        With an `atlas` manifest, relative to the Resources/Images folder, the images it packs
+        are taken from its pages, see Tools/pack_atlas.py.
         """
         self.ids: dict[str, int] = {}
         self.textures: list[pygame.Surface | None] = []
 
+        # transformed textures, from least to most recently used
+        self.variants: OrderedDict[_Variant, pygame.Surface] = OrderedDict()
+        self.variants_size = 0
+        self.budget = budget
+
+        # textures loaded before the display existed, converted once it does
+        self.unconverted: set[TextureId] = set()
+
+        self.loader = loader
+        self.pending: dict[TextureId, Future[pygame.Surface]] = {}  # textures still being decoded
+        self.paths: dict[TextureId, str] = {}  # the textures the loader has a copy of
+
+        # image path -> where it is packed, and the texture ids of packed images -> their page and area
+        self.atlas: dict[str, _Region] = {}
+        self.regions: dict[TextureId, tuple[TextureId, _Region]] = {}
+
+        if atlas is not None:
+            with open("Resources/Images/" + atlas, "r") as f:
+                manifest = json.load(f)
+
+            for path, entry in manifest["images"].items():
+                colorkey = entry.get("colorkey")
+                self.atlas[path] = _Region(
+                    page=manifest["pages"][entry["page"]],
+                    rect=tuple(entry["rect"]),
+                    colorkey=tuple(colorkey) if colorkey is not None else None,
+                )
+
+                if loader is not None:
+                    # maps preload the pages rather than the images they replace
+                    loader.alias("Resources/Images/" + path, "Resources/Images/" + self.atlas[path].page)
+
     def load(self, path: str) -> TextureId:
         """
         Loads an image from the given path and returns a texture id.
         For ease of use, the path must be relative to the Resources/Images folder.
+        With a loader, the id is returned right away and the image is missing from `get`
+        until it is decoded, while `unsafe_get` waits for it.
+        An image packed in the atlas is an area of its page, which is loaded instead.
         """
         if path not in self.ids:
-            self.ids[path] = len(self.textures)
-            self.textures.append(pygame.image.load("Resources/Images/" + path))
+            region = self.atlas.get(path)
+            page = self.load(region.page) if region is not None else None
+
+            uid = TextureId(len(self.textures))
+            self.ids[path] = uid
+
+            if page is not None:
+                self.textures.append(None)
+                self.regions[uid] = (page, region)  # type: ignore
+            elif self.loader is None:
+                self.textures.append(pygame.image.load("Resources/Images/" + path))
+                self.unconverted.add(uid)
+            else:
+                self.textures.append(None)
+                self.paths[uid] = "Resources/Images/" + path
+                self.pending[uid] = self.loader.image("Resources/Images/" + path)
+                self._collect()
+
+            self._convert()
 
         return TextureId(self.ids[path])
 
@@ -36,6 +114,16 @@ class ImageCache:
         """
         Returns the image associated with the given texture id, or None otherwise.
         """
+        if uid in self.regions:
+            page = self.get(self.regions[uid][0])
+            return self._region(uid, page) if page is not None else None
+
+        if self.pending:
+            self._collect()
+
+        if self.unconverted:
+            self._convert()
+
         return self.textures[uid] if uid >= 0 else None
 
     def unsafe_get(self, uid: TextureId) -> pygame.Surface:
@@ -43,10 +131,152 @@ class ImageCache:
         Returns the image associated with the given texture id. This method is unsafe
         and will throw an exception if the given texture id is invalid.
         """
+        if uid in self.regions:
+            return self._region(uid, self.unsafe_get(self.regions[uid][0]))
+
+        if uid in self.pending:
+            self._install(uid, self.pending.pop(uid).result())
+
+        if self.unconverted:
+            self._convert()
+
         return cast(pygame.Surface, self.textures[uid])
 
+    def set_colorkey(self, uid: TextureId, colorkey: tuple[int, int, int]):
+        """
+        Makes the given color transparent in the texture, with RLE acceleration.
+        """
+        if uid in self.regions:
+            _, region = self.regions[uid]
+            if region.colorkey != tuple(colorkey):
+                raise ValueError(f"the atlas was packed without the colorkey {tuple(colorkey)}")
+            return
+
+        self.unsafe_get(uid).set_colorkey(colorkey, pygame.RLEACCEL)
+        self.invalidate(uid)
+
     def has(self, uid: TextureId) -> bool:
         """
         Returns True if the given texture id is valid, False otherwise.
         """
-        return (0 <= uid < len(self.textures)) and (self.textures[uid] is not None)
+        if uid in self.regions:
+            return self.has(self.regions[uid][0])
+
+        return (0 <= uid < len(self.textures)) and (self.textures[uid] is not None or uid in self.pending)
+
+    def transformed(self, uid: TextureId,
+                    crop: pygame.Rect | tuple[int, int, int, int] | None = None,
+                    size: tuple[float, float] | None = None,
+                    flip: bool = False) -> pygame.Surface:
+        """
+        Returns the texture cropped to `crop`, scaled to `size` and flipped horizontally if `flip` is set,
+        in that order. The result is cached, so it must not be modified.
+        When the cached textures go over the budget, the least recently used ones are dropped.
+        """
+        if size is not None:
+            # same truncation as pygame.transform.scale
+            size = (int(size[0]), int(size[1]))
+
+        region = None
+
+        if uid in self.regions:
+            # every image of a page shares its cached variants
+            uid, region = self.regions[uid]
+            x, y = region.rect[:2]
+            if crop is not None:
+                cx, cy, cw, ch = crop
+                crop = (x + cx, y + cy, cw, ch)
+            else:
+                crop = region.rect
+
+        key = (uid, tuple(crop) if crop is not None else None, size, flip)
+
+        surf = self.variants.get(key)
+        if surf is not None:
+            self.variants.move_to_end(key)
+            return surf
+
+        if region is not None and not pygame.Rect(region.rect).contains(crop):  # type: ignore
+            # as a subsurface of the image would, rather than showing its neighbours in the atlas
+            raise ValueError("subsurface rectangle outside surface area")
+
+        surf = self.unsafe_get(uid)
+        if crop is not None:
+            surf = surf.subsurface(crop)
+        if size is not None:
+            surf = pygame.transform.scale(surf, size)
+        if flip:
+            surf = pygame.transform.flip(surf, True, False)
+
+        self.variants[key] = surf  # type: ignore
+        self.variants_size += _bytes(surf)
+
+        while self.variants_size > self.budget and len(self.variants) > 1:
+            _, old = self.variants.popitem(last=False)
+            self.variants_size -= _bytes(old)
+
+        return surf
+
+    def invalidate(self, uid: TextureId):
+        """
+        Drops the transformed versions of the given texture, must be called after modifying it.
+        """
+        if uid in self.regions:
+            uid = self.regions[uid][0]
+
+        for key in [k for k in self.variants if k[0] == uid]:
+            self.variants_size -= _bytes(self.variants.pop(key))
+
+    def _region(self, uid: TextureId, page: pygame.Surface) -> pygame.Surface:
+        """
+        Returns the area of the page holding a packed image, made once per page surface.
+        """
+        surf = self.textures[uid]
+
+        if surf is None or surf.get_parent() is not page:
+            _, region = self.regions[uid]
+            surf = self.textures[uid] = page.subsurface(region.rect)
+
+        return surf
+
+    def _collect(self):
+        """
+        Takes the textures the loader is done decoding.
+        """
+        for uid in [uid for uid, future in self.pending.items() if future.done()]:
+            self._install(uid, self.pending.pop(uid).result())
+
+    def _install(self, uid: TextureId, surf: pygame.Surface):
+        # converting it gives the cache its own copy of the loader's surface
+        self.textures[uid] = surf
+        self.unconverted.add(uid)
+
+    def _convert(self):
+        """
+        Converts the textures to the display's pixel format, so blitting them doesn't have to.
+        Does nothing until the display has been created.
+        """
+        if pygame.display.get_surface() is None:
+            return
+
+        for uid in self.unconverted:
+            surf = self.textures[uid]
+            if surf is None:
+                continue
+
+            if surf.get_flags() & pygame.SRCALPHA:
+                self.textures[uid] = surf.convert_alpha()
+            else:
+                self.textures[uid] = surf.convert()
+
+            self.invalidate(uid)
+
+            if uid in self.paths:
+                # the converted copy is the cache's own, the loader's is dropped
+                self.loader.release("image", self.paths.pop(uid))  # type: ignore
+
+        self.unconverted.clear()
+
+
+def _bytes(surf: pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
@@ -0,0 +1,374 @@
+"""
+    streamed map format, a folder holding the map cut in square chunks, see Tools/split_map.py
+
+    index.json:
+        - name: str                 # as in the map files
+        - background: Optional[str]
+        - tileset: str
+        - width: int                # size of the map in tiles
+        - height: int
+        - chunk: int                # size of the chunks in tiles
+        - start: (float, float)     # where the level starts, in tiles
+        - chunks: list[(int, int)]  # the chunks that have tiles or objects
+
+    <cx>_<cy>.wamap, for every chunk listed:
+        - the chunk's tiles, cut at the edges of the map
+        - the objects starting in the chunk, with their offsets relative to the map
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+import json
+import pickle
+import tempfile
+from typing import Any, Callable
+
+import numpy as np
+from pygame import Rect
+
+from Source.asset_loader import AssetLoader
+from Source.components import Position, Velocity
+from Source.entity import Component, Entity
+from Source.entity_list import EntityList
+from Source.image_cache import ImageCache
+from Source.systems.physics import solid_tiles
+from Source.tilemap import NULL_TILE, PropertyParser, TileMap, TilesetRegistry
+from Source import wamap
+
+
+INDEX = "index.json"
+
+_Chunk = tuple[int, int]
+
+
+@dataclass
+class Frozen(Component):
+    """
+    The velocity of an entity next to a chunk that isn't loaded, which stays where it is
+    until the chunks around it are, rather than falling through the tiles missing there.
+    """
+    x: float
+    y: float
+
+
+class MapStream:
+    """
+    Keeps the chunks of a streamed map near the camera in a TileMap, loading them in the background,
+    and evicts the least recently needed ones when they go over the memory budget.
+    The entities in an evicted chunk leave the map's objects as they are, and come back when it does:
+    they are pickled in the meantime, and written to a temporary file, farthest first,
+    when even that goes over the budget. The entities count as many bytes as they take pickled.
+    The ones next to a chunk that isn't loaded are `Frozen`.
+    """
+
+    def __init__(self, folder: str, images: ImageCache, parser: PropertyParser,
+                 loader: AssetLoader | None = None, tilesets: TilesetRegistry | None = None,
+                 prepare: Callable[[Entity], None] | None = None,
+                 budget: int = 16 * 1024 * 1024, margin: int = 1):
+        """
+        Opens the streamed map in the given folder, with no chunk loaded yet, see `update`.
+        `prepare` is called on every entity the first time it's created.
+        `budget` is how many bytes the stream may use, the tile and solid grids of the whole map
+        included, and `margin` how many chunks around the camera are loaded ahead of it.
+        """
+        self.folder = folder
+        self.images = images
+        self.parser = parser
+        self.loader = loader
+        self.prepare = prepare
+        self.budget = budget
+        self.margin = margin
+
+        if loader is not None:
+            index = loader.json(folder + "/" + INDEX).result()
+        else:
+            with open(folder + "/" + INDEX, "r") as f:
+                index = json.load(f)
+
+        self.size: int = index["chunk"]
+        self.start: tuple[float, float] = tuple(index["start"])  # type: ignore
+        self.stored: set[_Chunk] = {(cx, cy) for cx, cy in index["chunks"]}
+
+        width, height = index["width"], index["height"]
+
+        self.map = TileMap(
+            name=index["name"],
+            background=images.load(index.get("background")),
+            width=width,
+            height=height,
+            tileset=TileMap.load_tileset(
+                "./Resources/Maps/" + index["tileset"], images, loader, tilesets),
+            tiles=np.zeros(width * height, dtype=np.uint16),
+            objects=EntityList(),
+        )
+
+        # where the tiles collide, kept up to date as chunks come and go, see `solid_tiles`
+        self.solid = np.zeros((height, width), dtype=bool)
+
+        # loaded chunk -> the memory it uses, from least to most recently needed
+        self.loaded: OrderedDict[_Chunk, int] = OrderedDict()
+        # the grids cover the whole map, loaded or not
+        self.used = self.map.tiles.nbytes + self.solid.nbytes
+
+        self.pending: dict[_Chunk, Future] = {}
+        self.created: set[_Chunk] = set()  # the chunks whose objects were created
+
+        # which chunks have every chunk around them loaded, made again when one comes or goes
+        self.settled: np.ndarray | None = None
+
+        # the entities of the evicted chunks, pickled, in memory or at (offset, size) in `spill`
+        self.parked: dict[_Chunk, bytes] = {}
+        self.spilled: dict[_Chunk, tuple[int, int]] = {}
+        self.spill: Any = None  # the temporary file, made when first needed
+
+    def update(self, area: Rect, scale: float, wait: bool = False) -> list[tuple[int, int, int, int]]:
+        """
+        Loads the chunks around the area, in pixels when tiles are drawn `scale` times bigger,
+        and evicts the ones over the budget. With `wait`, the chunks overlapping the area are loaded
+        before returning, otherwise they are added once loaded by a later call.
+        Returns the tiles that changed, as (min x, min y, max x, max y) with the max excluded.
+        """
+        minx, miny, maxx, maxy = self.map.tile_range(area, scale, margin=self.margin * self.size)
+
+        needed = [
+            (cx, cy)
+            for cy in range(miny // self.size, (maxy - 1) // self.size + 1)
+            for cx in range(minx // self.size, (maxx - 1) // self.size + 1)
+        ]
+
+        for key in needed:
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+            elif key not in self.pending:
+                self.pending[key] = self._request(key)
+
+        if wait:
+            visible = self.map.tile_range(area, scale, margin=0)
+            for key in needed:
+                if key in self.pending and self._overlaps(key, visible):
+                    self.pending[key].result()
+
+        changed = []
+
+        for key in [key for key, future in self.pending.items() if future.done()]:
+            changed.append(self._install(key, self.pending.pop(key).result()))
+
+        keep = set(needed)
+        for key in list(self.loaded):
+            if self.used <= self.budget:
+                break
+
+            if key not in keep:
+                changed.append(self._evict(key))
+
+        if self.used > self.budget:
+            self._spill(((minx + maxx) / 2 / self.size, (miny + maxy) / 2 / self.size))
+
+        self._freeze()
+
+        return changed
+
+    def _request(self, key: _Chunk) -> Future:
+        if key not in self.stored:
+            # nothing on disk, the chunk is empty
+            future: Future = Future()
+            future.set_result(None)
+            return future
+
+        path = f"{self.folder}/{key[0]}_{key[1]}.wamap"
+
+        if self.loader is not None:
+            return self.loader.once(path, wamap.read)
+
+        future = Future()
+        future.set_result(wamap.read(path))
+        return future
+
+    def _install(self, key: _Chunk, data: dict[str, Any] | None) -> tuple[int, int, int, int]:
+        x0, y0, x1, y1 = bounds = self._bounds(key)
+
+        if data is not None:
+            tiles = self._grid()[y0:y1, x0:x1]
+            tiles[:] = np.asarray(data["tiles"]).reshape(y1 - y0, x1 - x0)
+            wamap.close(data)  # the tiles were copied
+
+            self.solid[y0:y1, x0:x1] = solid_tiles(
+                tiles, x1 - x0, y1 - y0, self.map.tileset.flags)
+
+        if key in self.parked:
+            blob = self.parked.pop(key)
+            self.used -= len(blob)
+            entities = pickle.loads(blob)
+        elif key in self.spilled:
+            offset, weight = self.spilled.pop(key)
+            self.spill.seek(offset)
+            blob = self.spill.read(weight)
+            entities = pickle.loads(blob)
+        elif key not in self.created and data is not None:
+            entities = [
+                TileMap.load_object(obj, self.images, self.parser) for obj in data["objects"]
+            ]
+
+            if self.prepare is not None:
+                for entity in entities:
+                    self.prepare(entity)
+
+            # measured before they join the list, as they would be parked
+            blob = pickle.dumps(entities, pickle.HIGHEST_PROTOCOL) if entities else b""
+        else:
+            entities = []
+            blob = b""
+
+        self.created.add(key)
+
+        for entity in entities:
+            self.map.objects.add(entity)
+
+        size = (x1 - x0) * (y1 - y0) * self.map.tiles.itemsize + len(blob)
+        self.loaded[key] = size
+        self.used += size
+        self.settled = None
+
+        return bounds
+
+    def _evict(self, key: _Chunk) -> tuple[int, int, int, int]:
+        x0, y0, x1, y1 = bounds = self._bounds(key)
+
+        self._grid()[y0:y1, x0:x1] = NULL_TILE
+        self.solid[y0:y1, x0:x1] = False
+
+        # the entities belong to the chunk they are in now
+        entities = [
+            entity for entity in self.map.objects.query(Position).ids()
+            if self._chunk_of(entity.unsafe_get(Position)) == key
+        ]
+
+        for entity in entities:
+            # their column values are copied back into them
+            self.map.objects.remove(entity)
+
+        self.used -= self.loaded.pop(key)
+        self.settled = None
+
+        if entities:
+            blob = pickle.dumps(entities, pickle.HIGHEST_PROTOCOL)
+            self.parked[key] = blob
+            self.used += len(blob)
+
+        return bounds
+
+    def _spill(self, center: tuple[float, float]):
+        """
+        Writes the parked entities farthest from the given chunk to the temporary file,
+        until the stream is within its budget.
+        """
+        cx, cy = center
+
+        def distance(key: _Chunk) -> float:
+            return (key[0] - cx) ** 2 + (key[1] - cy) ** 2
+
+        if self.spill is None:
+            self.spill = tempfile.TemporaryFile()
+
+        for key in sorted(self.parked, key=distance, reverse=True):
+            if self.used <= self.budget:
+                break
+
+            blob = self.parked.pop(key)
+
+            # the space of the chunks read back isn't reused
+            offset = self.spill.seek(0, 2)
+            self.spill.write(blob)
+            self.spilled[key] = (offset, len(blob))
+
+            self.used -= len(blob)
+
+    def _freeze(self):
+        """
+        Takes the velocity of the entities next to a chunk that isn't loaded, so that no system
+        moves them onto tiles that aren't there, and gives it back once the chunks around them are.
+        """
+        settled = self._settled()
+
+        for entity in self.map.objects.query(Frozen, Position).ids():
+            if settled[self._chunk_of(entity.unsafe_get(Position))[::-1]]:
+                frozen = entity.unsafe_get(Frozen)
+                entity.add(Velocity(frozen.x, frozen.y))
+                entity.remove(Frozen)
+
+        store = self.map.objects.columns
+
+        if store is not None and store.stores(Position) and store.stores(Velocity):
+            # every entity at once, only the ones to freeze are looked up
+            pos = store.column(Position)
+            x = np.clip(np.trunc(pos[:, 0]), 0, self.map.width - 1).astype(np.int64) // self.size
+            y = np.clip(np.trunc(pos[:, 1]), 0, self.map.height - 1).astype(np.int64) // self.size
+
+            moving = store.mask(Position, Velocity) & ~settled[y, x]
+            if not moving.any():
+                return
+
+            slots = set(np.flatnonzero(moving).tolist())
+            entities = [entity for entity, slot in store.slots.items() if slot in slots]
+        else:
+            entities = [
+                entity for entity in self.map.objects.query(Position, Velocity).ids()
+                if not settled[self._chunk_of(entity.unsafe_get(Position))[::-1]]
+            ]
+
+        for entity in entities:
+            vel = entity.unsafe_get(Velocity)
+            entity.add(Frozen(vel.x, vel.y))
+            entity.remove(Velocity)
+
+    def _settled(self) -> np.ndarray:
+        """
+        Returns which chunks have every chunk around them loaded, indexed [cy, cx].
+        The chunks off the map and the empty ones count as loaded, there is nothing in them.
+        """
+        if self.settled is not None:
+            return self.settled
+
+        h = (self.map.height + self.size - 1) // self.size
+        w = (self.map.width + self.size - 1) // self.size
+
+        ready = np.ones((h + 2, w + 2), dtype=bool)
+        for cx, cy in self.stored:
+            ready[cy + 1, cx + 1] = (cx, cy) in self.loaded
+
+        settled = np.ones((h, w), dtype=bool)
+        for dy in range(3):
+            for dx in range(3):
+                settled &= ready[dy:dy + h, dx:dx + w]
+
+        self.settled = settled
+        return settled
+
+    def _grid(self) -> np.ndarray:
+        return self.map.tiles.reshape(self.map.height, self.map.width)
+
+    def _bounds(self, key: _Chunk) -> tuple[int, int, int, int]:
+        """
+        Returns the tiles of the chunk, as (min x, min y, max x, max y) with the max excluded.
+        """
+        cx, cy = key
+        return (
+            cx * self.size,
+            cy * self.size,
+            min(self.map.width, (cx + 1) * self.size),
+            min(self.map.height, (cy + 1) * self.size),
+        )
+
+    def _overlaps(self, key: _Chunk, tiles: tuple[int, int, int, int]) -> bool:
+        x0, y0, x1, y1 = self._bounds(key)
+        minx, miny, maxx, maxy = tiles
+        return x0 < maxx and minx < x1 and y0 < maxy and miny < y1
+
+    def _chunk_of(self, pos: Position) -> _Chunk:
+        """
+        Returns the chunk at the given position, or the nearest one if it's off the map.
+        """
+        x = min(max(int(pos.x), 0), self.map.width - 1)
+        y = min(max(int(pos.y), 0), self.map.height - 1)
+        return (x // self.size, y // self.size)
@@ -11,6 +11,7 @@ class Profile:
     controls: Controls
     bg: float = 0.5
     sfx: float = 0.5
+    native: bool = False  # draw the levels at their native resolution, see Level
 
     @staticmethod
     def temporary() -> "Profile":
@@ -39,6 +40,7 @@ class Profile:
             profile.controls = Controls(**data['controls'])
             profile.bg = float(data['bg'])
             profile.sfx = float(data['sfx'])
+            profile.native = bool(data.get('native', False))
 
             return profile
 
@@ -58,5 +60,6 @@ class Profile:
             json.dump({
                 'controls': self.controls.__dict__,
                 'bg': self.bg,
-                'sfx': self.sfx
+                'sfx': self.sfx,
+                'native': self.native
             }, f)
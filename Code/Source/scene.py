@@ -5,6 +5,7 @@ from dataclasses import dataclass
 import pygame
 from pygame import event
 
+from Source.asset_loader import AssetLoader
 from Source.scene_context import SceneContext
 
 
@@ -21,6 +22,14 @@ class Scene(metaclass=abc.ABCMeta):
         """
         scene: "Scene"
 
+    @dataclass
+    class Replace:
+        """
+            Command to replace the current scene with a new one.
+            Return this from ```input``` to swap the current scene without returning to it.
+        """
+        scene: "Scene"
+
     class Pop:
         """
             Command to pop the current scene from the scenes stack.
@@ -42,10 +51,42 @@ class Scene(metaclass=abc.ABCMeta):
         """
         pass
 
-    Command = Push | Pop | PopAll | Continue
+    @dataclass
+    class Overlay:
+        """
+            Tells how an overlay scene shows the scene below it.
+            Return this from ```overlay``` to draw the scene over a snapshot of the one below.
+        """
+        tint: pygame.Color | None = None
+        """
+            Color blended over the snapshot, e.g. translucent black to dim it.
+        """
+        blur: int = 0
+        """
+            How much to blur the snapshot, as the factor it is shrunk by before being stretched back.
+        """
+
+        def backdrop(self, snapshot: pygame.Surface) -> pygame.Surface:
+            """
+                Returns the snapshot blurred and tinted.
+            """
+            if self.blur > 1:
+                size = snapshot.get_size()
+                snapshot = pygame.transform.smoothscale(
+                    pygame.transform.smoothscale_by(snapshot, 1 / self.blur), size)
+
+            if self.tint is not None:
+                veil = pygame.Surface(snapshot.get_size(), pygame.SRCALPHA)
+                veil.fill(self.tint)
+                snapshot.blit(veil, (0, 0))
+
+            return snapshot
+
+    Command = Push | Replace | Pop | PopAll | Continue
     """
         Commands that can be returned from ```input``` to handle the current scene.
         If Push or Pop is returned, the current scene will be exited or entered respectively.
+        If Replace is returned, the current scene will be exited and the new one entered in its place.
         If PopAll is returned, the application will quit.
         If Continue is returned, the current scene will continue to be updated and drawn.
     """
@@ -57,6 +98,13 @@ class Scene(metaclass=abc.ABCMeta):
         """
         pass
 
+    def preload(self, loader: AssetLoader):
+        """
+            Optional method requesting the assets the scene needs, before it is entered.
+            Called by the loading scene, which waits for them.
+        """
+        pass
+
     def exit(self):
         """
             Optional method called when exiting the scene.
@@ -72,8 +120,32 @@ class Scene(metaclass=abc.ABCMeta):
         """
         return Scene.Continue()
 
+    def idle(self) -> bool:
+        """
+            Optional method telling whether the scene has nothing animating,
+            i.e. it only changes in response to events.
+            While it returns True, the application waits for events instead of updating every frame.
+        """
+        return False
+
+    def overlay(self) -> "Scene.Overlay | None":
+        """
+            Optional method telling whether the scene is drawn over the one below it.
+            If it returns an Overlay, a snapshot of the screen is taken when the scene is pushed,
+            and drawn under the scene every frame instead of the scene below.
+        """
+        return None
+
+    def dirty_rects(self) -> bool:
+        """
+            Optional method telling whether everything the scene draws comes from the UI context.
+            While it returns True, only the parts of the screen where widgets changed are redrawn
+            and presented. Scenes that scroll or draw on their own must return False.
+        """
+        return False
+
     @abc.abstractclassmethod
-    def update(self, dt: int):
+    def update(self, dt: float):
         """
             Called every frame to update the state of the objects.
             Must be implemented by the subclass.
@@ -81,9 +153,24 @@ class Scene(metaclass=abc.ABCMeta):
         pass
 
     @abc.abstractclassmethod
-    def draw(self):
+    def draw(self, alpha: float):
         """
             Called every frame to render objects of the scene.
+            `alpha` is how far the frame is between the last update and the next one, from 0 to 1,
+            and can be used to interpolate moving objects.
             Must be implemented by the subclass.
         """
         pass
+
+
+class Menu(Scene):
+    """
+        A scene made only of widgets, which change in response to events.
+        It waits for events instead of updating every frame, and only redraws what the widgets changed.
+    """
+
+    def idle(self) -> bool:
+        return True
+
+    def dirty_rects(self) -> bool:
+        return True
@@ -1,14 +1,17 @@
+import os
 from typing import cast
 
 import pygame
 
 from Source import ui
 
+from Source.asset_loader import AssetLoader
 from Source.assets import Assets, FailedToLoadAssets
 from Source.camera import Camera
 from Source.font_cache import FontCache
 from Source.image_cache import ImageCache
 from Source.profile import Profile
+from Source.tilemap import TilesetRegistry
 
 
 class SceneContext:
@@ -17,8 +20,13 @@ class SceneContext:
     """
 
     def __init__(self):
-        self.images = ImageCache()
-        self.fonts = FontCache()
+        self.loader = AssetLoader()
+        # the sprite sheets packed by Tools/pack_atlas.py, if they were
+        atlas = "atlas.json" if os.path.exists("Resources/Images/atlas.json") else None
+
+        self.images = ImageCache(loader=self.loader, atlas=atlas)
+        self.fonts = FontCache(self.loader)
+        self.tilesets = TilesetRegistry(self.images, self.loader)
 
         assets = Assets.load(self.images, self.fonts)
 
@@ -28,6 +36,10 @@ class SceneContext:
         self.assets = cast(Assets, assets)
         self.ui = ui.Context(self.images, self.fonts)
 
+        # the arcade font is a bitmap font, its glyphs are drawn as they are
+        for font in (self.assets.ARCADE_24, self.assets.ARCADE_48, self.assets.ARCADE_72, self.assets.ARCADE_96):
+            self.ui.use_atlas(font)
+
         self.camera = Camera(pygame.display.get_surface())
 
         self.restart = True
@@ -5,10 +5,10 @@ import pygame
 from Source import ui
 
 from Source.profile import Profile
-from Source.scene import Scene, SceneContext
+from Source.scene import Menu, Scene, SceneContext
 
 
-class ConfirmDelete(Scene):
+class ConfirmDelete(Menu):
     def __init__(self, profile: int):
         super().__init__()
         self.profile = profile
@@ -31,7 +31,7 @@ class ConfirmDelete(Scene):
         
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
 
         ui.cut_top(rect, 200)
@@ -59,6 +59,6 @@ class ConfirmDelete(Scene):
         if self.ctx.button_layout(ui.center(no), "No", self.assets.ARCADE_48):
             self.cancel = True
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
@@ -4,10 +4,10 @@ import pygame
 
 from Source import ui
 
-from Source.scene import Scene, SceneContext
+from Source.scene import Menu, Scene, SceneContext
 
 
-class CongratsScene(Scene):
+class CongratsScene(Menu):
     def __init__(self):
         super().__init__()
 
@@ -22,7 +22,7 @@ class CongratsScene(Scene):
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
 
         ui.cut_top(rect, 100)
@@ -38,6 +38,6 @@ class CongratsScene(Scene):
         self.ctx.text_layout(
             ui.center(then), "Go  tell  everyone!", self.assets.ARCADE_48)
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
@@ -3,12 +3,12 @@
 import pygame
 
 from Source import ui
-from Source.scene import Scene
+from Source.scene import Menu, Scene
 from Source.scene_context import SceneContext
 from Source.profile import Profile
 
 
-class GameOver(Scene):
+class GameOver(Menu):
     def __init__(self):
         super().__init__()
 
@@ -32,7 +32,10 @@ class GameOver(Scene):
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def overlay(self) -> Scene.Overlay:
+        return Scene.Overlay(tint=pygame.Color(255, 255, 255, 200), blur=4)
+
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
 
         ui.cut_top(rect, 100)
@@ -52,6 +55,6 @@ class GameOver(Scene):
         self.quit = self.ctx.button_layout(
             ui.center(quit), "QUIT", self.assets.ARCADE_48)
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
@@ -1,15 +1,25 @@
 
 import json
+from math import ceil
 from pathlib import Path
 from typing import Any
 
 import pygame
 from pygame import event
 
+from Source.column_store import ColumnStore
+from Source.entity import Entity
+from Source.entity_list import EntityList
+from Source.framebuffer import Framebuffer
+from Source.map_stream import INDEX, MapStream
 from Source.components import *
 from Source.profile import Profile
+from Source.asset_loader import AssetLoader
+from Source.camera import Camera
 from Source.scene import Scene
 from Source.scene_context import SceneContext
+from Source.spatial_hash import SpatialHash
+from Source.tile_chunks import TileChunks
 from Source.tilemap import TileMap
 
 from Source.scenes.game_over import GameOver
@@ -88,13 +98,38 @@ def parse(key: str, value: Any) -> Component:
 
 DUMMY_EVENT = pygame.event.Event(pygame.USEREVENT, kind="dummy")
 
+# render queue layers
+_TILES, _OBJECTS, _PLAYER = range(3)
+
+_TRANSPARENT = (255, 0, 255)
+"""
+The framebuffer's colorkey, where the background shows through.
+"""
+
+_BLINK = 50
+"""
+How long in ms the player stays shown, then hidden, while invulnerable.
+"""
+
+ENEMY_CELL = 64
+"""
+The size of the spatial hash cells used for enemy collisions.
+"""
+
 
 class Level(Scene):
-    def __init__(self, file: str, profile: Profile):
+    def __init__(self, file: str, profile: Profile, native: bool = False, scale2x: bool = False):
         super().__init__()
         self.file = file
         self.profile = profile
 
+        # draw the world at its native resolution, then upscale it once to the window,
+        # a setting of the profile (off by default) since the software upscale costs more
+        # than drawing the world scaled
+        self.native = native
+        self.scale2x = scale2x
+        self.framebuffer: Framebuffer | None = None
+
         self.pu_list = {
             "shield": PowerupData(start=(16, 0), duration=2000,),
             # "speed": PowerupData(),
@@ -110,6 +145,24 @@ class Level(Scene):
 
         self.dirty: set[TextureId] = set()
 
+        # the objects as they were right after loading, restored on restart
+        self.pristine: EntityList | None = None
+
+        # levels saved in chunks (.stream) are loaded around the camera as it moves
+        self.stream: MapStream | None = None
+
+        # broadphase for the player-enemy collisions, rebuilt every update
+        self.enemies = SpatialHash(ENEMY_CELL)
+
+        # broadphase for the powerup pickups, filled when objects come or go, see `track_powerups`
+        self.powerups = SpatialHash(POWERUP_CELL)
+
+    def preload(self, loader: AssetLoader):
+        if self.file.endswith(".stream"):
+            loader.json("./Resources/Maps/" + self.file + "/" + INDEX)
+        else:
+            loader.map("./Resources/Maps/" + self.file)
+
     def enter(self, ctx: SceneContext):
         self.assets = ctx.assets
         self.images = ctx.images
@@ -127,29 +180,110 @@ class Level(Scene):
 
             self.timer = 0
 
+            if self.pristine is None:
+                self._load(ctx)
+            else:
+                # the tiles never change, only the objects go back to how they were
+                self.map.objects = self.pristine.clone()
+
+            track_powerups(self.map.objects, self.map.tileset.tile_size, self.powerups)
+
+            pygame.mixer.music.rewind()
+
+        pygame.mixer.music.play(-1)
+
+        self._save_state()
+
+    def _load(self, ctx: SceneContext):
+        """
+        Loads the map and prepares its objects, then keeps a copy of them to restart from.
+        A streamed map is only opened, and starts with the chunks around the player.
+        """
+        if self.file.endswith(".stream"):
+            self.stream = MapStream(
+                "./Resources/Maps/" + self.file, self.images, parse, ctx.loader, ctx.tilesets,
+                prepare=self._prepare)
+            self.map = self.stream.map
+        else:
+            self.stream = None
             self.map = TileMap.load(
-                "./Resources/Maps/" + self.file, self.images, parse)
+                "./Resources/Maps/" + self.file, self.images, parse, ctx.loader, ctx.tilesets)
 
-            for obj in self.map.objects.all():
-                obj.add(Velocity(0, 0))
-                obj.add(Active())
+        # keep positions, velocities, sizes and colliders in arrays
+        # so the physics systems can update every object at once
+        self.map.objects.attach(
+            ColumnStore(Position, Velocity, Size, Collider))
 
-            for _, size in self.map.objects.query(Powerup, Size).types():
-                size.w *= 0.5
-                size.h *= 0.5
+        if self.stream is not None:
+            self.solid = self.stream.solid
+        else:
+            self.solid = solid_tiles(
+                self.map.tiles, self.map.width, self.map.height, self.map.tileset.flags)
 
-            if self.map.background is not None and self.map.background not in self.dirty:
-                bg = self.images.unsafe_get(self.map.background)
-                bg.fill((80, 80, 80), special_flags=pygame.BLEND_SUB)
-                self.dirty.add(self.map.background)
+        # the tile layer only changes as chunks are streamed, it's pre-rendered in chunks
+        self.chunks = TileChunks(self.map, self.images)
 
-            if self.map.tileset.colorkey is not None:
-                self.images.unsafe_get(self.map.tileset.image).set_colorkey(
-                    self.map.tileset.colorkey)
+        for obj in self.map.objects.all():
+            self._prepare(obj)
 
-            pygame.mixer.music.rewind()
+        if self.map.background is not None and self.map.background not in self.dirty:
+            bg = self.images.unsafe_get(self.map.background)
+            bg.fill((80, 80, 80), special_flags=pygame.BLEND_SUB)
+            self.dirty.add(self.map.background)
+            self.images.invalidate(self.map.background)
 
-        pygame.mixer.music.play(-1)
+        if self.map.tileset.colorkey is not None:
+            self.images.set_colorkey(
+                self.map.tileset.image, self.map.tileset.colorkey)
+
+        if self.stream is not None:
+            self._follow(*self.stream.start)
+            self._stream(wait=True)
+        else:
+            self.pristine = self.map.objects.clone()
+
+    def _prepare(self, obj: Entity):
+        """
+        Readies an object of the map for the game.
+        """
+        obj.add(Velocity(0, 0))
+        obj.add(Active())
+
+        if obj.has((Powerup, Size)):
+            size = obj.unsafe_get(Size)
+            size.w *= 0.5
+            size.h *= 0.5
+
+    def _stream(self, wait: bool = False):
+        """
+        Loads the chunks around the camera and evicts the far ones, see MapStream.
+        """
+        tile_size = self.map.tileset.tile_size
+        scale = self.camera.area.h // tile_size[1] // self.map.height
+
+        # the stream keeps the solid grid up to date, only the baked tiles are left
+        changed = self.stream.update(self.camera.area, scale, wait)  # type: ignore
+        for region in changed:
+            self.chunks.invalidate(region)
+
+        if changed:
+            # objects came or went with the chunks
+            track_powerups(self.map.objects, tile_size, self.powerups)
+
+    def _follow(self, x: float, y: float):
+        """
+        Centers the camera on the given position in tiles, without showing past the map's edges.
+        """
+        tile_size = self.map.tileset.tile_size
+        scale = self.camera.area.h // tile_size[1] // self.map.height
+
+        self.camera.area.centerx = int(x * scale * tile_size[0])
+        self.camera.area.centery = int(y * scale * tile_size[1])
+
+        self.camera.area.x = max(
+            0, min(self.camera.area.x, self.map.width * tile_size[0] * scale - self.camera.area.w))
+        self.camera.area.y = max(
+            0, min(self.camera.area.y, self.map.height * tile_size[1] * scale - self.camera.area.h))
 
     def input(self, event: event.Event) -> Scene.Command:
         self.ctx.feed(event)
@@ -186,11 +320,11 @@ class Level(Scene):
                 if self.file not in scores:
                     scores[self.file] = {}
                     scores[self.file]["profile"] = self.profile.name[:-5]
-                    scores[self.file]["score"] = self.timer // 1000
+                    scores[self.file]["score"] = int(self.timer // 1000)
 
                 elif self.timer // 1000 < scores[self.file]["score"]:
                     scores[self.file]["profile"] = self.profile.name[:-5]
-                    scores[self.file]["score"] = self.timer // 1000
+                    scores[self.file]["score"] = int(self.timer // 1000)
 
                 f.seek(0)
                 json.dump(scores, f)
@@ -205,7 +339,7 @@ class Level(Scene):
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         self.timer += dt
         self.undead_timer -= dt
 
@@ -216,6 +350,12 @@ class Level(Scene):
 
         # Game Logic
 
+        if self.stream is not None:
+            # before the positions are saved, so the objects paged in aren't interpolated
+            self._stream()
+
+        self._save_state()
+
         update_animations(self.map.objects, dt)
 
         # mark_visible_enemies(
@@ -236,22 +376,36 @@ class Level(Scene):
             tile_size=self.map.tileset.tile_size,
             tiles=self.map.tiles,
             map_w=self.map.width, map_h=self.map.height,
+            flags=self.map.tileset.flags,
+            solid=self.solid,
         )
 
         handle_player_collisions(
-            self.map.objects, self.map.tileset.tile_size,
+            self.map.objects, self.map.tileset.tile_size, self.powerups,
         )
 
+        tile_size = self.map.tileset.tile_size
+        scale = self.camera.area.h // tile_size[1] // self.map.height
+
+        def enemy_area(e: Entity) -> pygame.Rect:
+            epos = e.unsafe_get(Position)
+            esize = e.unsafe_get(Size)
+
+            return pygame.Rect(
+                epos.x * scale,
+                epos.y * scale,
+                esize.w,
+                esize.h,
+            )
+
+        self.enemies.rebuild(
+            self.map.objects.query(Enemy, Active, Position, Size).ids(), enemy_area)
+
         for p in self.map.objects.query(Player, Position, Size, Collider).ids():
             pos = p.unsafe_get(Position)
             size = p.unsafe_get(Size)
             coll = p.unsafe_get(Collider)
 
-            cam = self.camera.area
-
-            tile_size = self.map.tileset.tile_size
-            scale = cam.h // tile_size[1] // self.map.height
-
             # check if goal reached
             for _, gpos in self.map.objects.query(Goal, Position).types():
                 if gpos.x - 1 <= pos.x <= gpos.x + 1:
@@ -266,15 +420,8 @@ class Level(Scene):
 
 
             # check if collided with enemy
-            for _, _, epos, esize in self.map.objects.query(Enemy, Active, Position, Size).types():
-                earea = pygame.Rect(
-                    epos.x * scale,
-                    epos.y * scale,
-                    esize.w,
-                    esize.h,
-                )
-
-                if parea.colliderect(earea):
+            for e in self.enemies.query_rect(parea):
+                if parea.colliderect(self.enemies.rects[e]):
                     if p.has(Shield):
                         p.remove(Shield)
                         self.undead_timer = self.pu_list["shield"].duration
@@ -297,19 +444,32 @@ class Level(Scene):
                 return
 
             # center camera on player
-            self.camera.area.centerx = int(pos.x * scale * tile_size[0])
-            self.camera.area.centery = int(pos.y * scale * tile_size[1])
-
-            self.camera.area.x = max(
-                0, min(self.camera.area.x, self.map.width * tile_size[0] * scale - self.camera.area.w))
-            self.camera.area.y = max(
-                0, min(self.camera.area.y, self.map.height * tile_size[1] * scale - self.camera.area.h))
+            self._follow(pos.x, pos.y)
 
         self._ui()
 
-    def _ui(self):
-        pygame.display.get_surface().fill((0, 0, 0))
+    def _save_state(self):
+        """
+        Remembers where the objects and the camera are before they move,
+        so `draw` can interpolate between two updates.
+        """
+        self.prev_pos = self.map.objects.columns.column(Position).copy()
+        self.prev_cam = self.camera.area.topleft
+
+    def _lerp_pos(self, obj: Entity, alpha: float) -> tuple[float, float]:
+        """
+        Returns the position of the object `alpha` of the way between the last two updates.
+        """
+        pos = obj.unsafe_get(Position)
+        slot = self.map.objects.columns.slots[obj]
+
+        if slot >= len(self.prev_pos):
+            return pos.x, pos.y
+
+        x, y = self.prev_pos[slot]
+        return x + (pos.x - x) * alpha, y + (pos.y - y) * alpha
 
+    def _ui(self):
         rect = pygame.display.get_surface().get_rect()
 
         ui.cut_left(rect, 20)
@@ -352,77 +512,86 @@ class Level(Scene):
             powerup_widget(rect, Powerup2, "2")
 
         self.ctx.text_layout(
-            ui.right(rect), f"{(self.timer//1000):>03}",
+            ui.right(rect), f"{int(self.timer // 1000):>03}",
             self.assets.ARCADE_24,
             color=pygame.Color(255, 255, 255))
 
-    def draw(self):
-        if self.map.background is not None:
-            _, _, w, h = self.camera.screen.get_rect()
+    def draw(self, alpha: float):
+        # move the camera between its last two positions, restored once done
+        cam = self.camera.area.topleft
+        self.camera.area.topleft = (
+            round(self.prev_cam[0] + (cam[0] - self.prev_cam[0]) * alpha),
+            round(self.prev_cam[1] + (cam[1] - self.prev_cam[1]) * alpha),
+        )
 
-            bg = self.images.unsafe_get(self.map.background)
-            bg = pygame.transform.scale(bg, (w, h))
+        scale = (pygame.display.get_surface(
+        ).get_height() // self.map.height) / self.map.tileset.tile_size[1]
 
-            self.camera.render(bg)
+        self.camera.screen.fill((0, 0, 0))
 
-        tile_size = self.map.tileset.tile_size
+        if self.map.background is not None:
+            # the background isn't pixel art, it's drawn at the window's resolution
+            self.camera.render(self.images.transformed(
+                self.map.background, size=self.camera.screen.get_size()))
+
+        if self.native:
+            framebuffer = self._framebuffer(scale)
+            framebuffer.clear()
+
+            # the camera moves in window pixels
+            self.view.area.topleft = (
+                round(self.camera.area.x / scale),
+                round(self.camera.area.y / scale),
+            )
 
-        map_w = self.map.width
-        map_h = self.map.height
+            self._render_world(self.view, 1, alpha)
 
-        offset = (0, 0)
-        scale = (pygame.display.get_surface(
-        ).get_height() // map_h) / tile_size[1]
+            # upscaled by the same ratio, so the world lines up with the camera
+            framebuffer.present(self.camera.screen, scale)
+        else:
+            self._render_world(self.camera, scale, alpha)
+
+        self.camera.area.topleft = cam
+
+        # render UI
+        self.ctx.draw(self.camera.screen)
 
-        ts = self.images.unsafe_get(self.map.tileset.image)
-        ts = pygame.transform.scale_by(ts, scale)
+    def _render_world(self, camera: Camera, scale: float, alpha: float):
+        tile_size = self.map.tileset.tile_size
 
         # render tiles
-        for j in range(map_h):
-            for i in range(map_w):
-                tile = self.map.tiles[i + j * map_w]
-                if tile == 0:
-                    continue
-
-                tile_offset = self.map.tileset.tiles[tile].offset
-
-                area = pygame.Rect(
-                    tile_offset[0] * scale,
-                    tile_offset[1] * scale,
-                    tile_size[0] * scale,
-                    tile_size[1] * scale,
-                )
-
-                dst = (
-                    int(tile_size[0] * i * scale + offset[0]),
-                    int(tile_size[1] * j * scale + offset[1]),
-                )
-
-                # TODO:
-                # replace this with `blits`
-                # which processes a list of surfaces
-                self.camera.render(ts, dst, area)
+        self.chunks.render(camera, scale, layer=_TILES)
 
         # render objects
         for obj in self.map.objects.query(Active, Sprite, Position, Size).ids():
             sprite = obj.unsafe_get(Sprite)
-            pos = obj.unsafe_get(Position)
+            x, y = self._lerp_pos(obj, alpha)
             size = obj.unsafe_get(Size)
 
-            tex = self.images.unsafe_get(
-                sprite.uid).subsurface(sprite.rect)
-            tex = pygame.transform.scale(tex, (scale * size.w, scale * size.h))
-
-            if sprite.flip:
-                tex = pygame.transform.flip(tex, True, False)
+            tex = self.images.transformed(
+                sprite.uid, sprite.rect, (scale * size.w, scale * size.h), sprite.flip)
 
             if obj.has(Player):
-                if self.undead_timer % 2 == 0:
-                    self.camera.render(
-                        tex, (int(tile_size[0] * pos.x * scale), int(tile_size[1] * pos.y * scale)))
+                if int(self.undead_timer // _BLINK) % 2 == 0:
+                    camera.submit(
+                        tex, (int(tile_size[0] * x * scale), int(tile_size[1] * y * scale)), layer=_PLAYER)
             else:
-                self.camera.render(
-                    tex, (int(tile_size[0] * pos.x * scale), int(tile_size[1] * pos.y * scale)))
+                camera.submit(
+                    tex, (int(tile_size[0] * x * scale), int(tile_size[1] * y * scale)), layer=_OBJECTS)
 
-        # render UI
-        self.ctx.draw(self.camera.screen)
+        camera.flush()
+
+    def _framebuffer(self, scale: float) -> Framebuffer:
+        """
+        Returns the framebuffer, big enough to cover the window once upscaled `scale` times.
+        """
+        screen = self.camera.screen
+
+        size = (ceil(screen.get_width() / scale), ceil(screen.get_height() / scale))
+
+        if self.framebuffer is None or self.framebuffer.surface.get_size() != size:
+            self.framebuffer = Framebuffer(
+                size, screen, self.scale2x, colorkey=_TRANSPARENT)
+            self.view = Camera(self.framebuffer.surface)
+
+        return self.framebuffer
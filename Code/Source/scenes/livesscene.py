@@ -29,15 +29,19 @@ class LivesScene(Scene):
 
         return Scene.Pop() if self.timer > 1500 else Scene.Continue()
 
-    def update(self, dt: int):
+    def overlay(self) -> Scene.Overlay:
+        return Scene.Overlay(tint=pygame.Color(0, 0, 0, 220))
+
+    def dirty_rects(self) -> bool:
+        return True
+
+    def update(self, dt: float):
         self.timer += dt
 
         if self.timer > 1500:
             # trigger a dummy event so that `input` is called
             pygame.event.post(DUMMY_EVENT)
 
-        pygame.display.get_surface().fill((0, 0, 0))
-
         rect = pygame.display.get_surface().get_rect()
 
         ui.cut_top(rect, 250)
@@ -63,6 +67,6 @@ class LivesScene(Scene):
         self.ctx.text(l, str(self.lives),
                       self.assets.ARCADE_96, color=pygame.Color(255, 255, 255))
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
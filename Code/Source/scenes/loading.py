@@ -0,0 +1,65 @@
+import pygame
+
+from Source import ui
+from Source.scene import Scene, SceneContext
+
+DUMMY_EVENT = pygame.event.Event(pygame.USEREVENT, kind="dummy")
+
+
+class LoadingScene(Scene):
+    """
+    Shows the progress of the assets a scene preloads, then replaces itself with that scene.
+    """
+
+    def __init__(self, scene: Scene):
+        super().__init__()
+        self.scene = scene
+
+    def enter(self, ctx: SceneContext):
+        self.assets = ctx.assets
+        self.ctx = ctx.ui
+        self.camera = ctx.camera
+        self.loader = ctx.loader
+
+        # only the requests made by the scene count towards the progress
+        self.start = len(self.loader.requested)
+        self.scene.preload(self.loader)
+
+        self.ready = False
+
+    def input(self, event: pygame.event.Event) -> Scene.Command:
+        # inform the UI context of the event
+        self.ctx.feed(event)
+
+        return Scene.Replace(self.scene) if self.ready else Scene.Continue()
+
+    def dirty_rects(self) -> bool:
+        return True
+
+    def update(self, dt: float):
+        done, total = self.loader.progress(self.start)
+
+        if done == total and not self.ready:
+            self.ready = True
+            self.loader.finish()
+
+            # trigger a dummy event so that `input` is called
+            pygame.event.post(DUMMY_EVENT)
+
+        rect = pygame.display.get_surface().get_rect()
+
+        ui.cut_top(rect, 200)
+        head, body = ui.cut_top(rect, 100)
+
+        self.ctx.text_layout(
+            ui.center(head), "Loading", self.assets.ARCADE_48)
+
+        ui.cut_left(body, 250)
+        ui.cut_right(body, 250)
+
+        bar, _ = ui.cut_top(body, 8)
+        self.ctx.progress(bar, done / total if total > 0 else 1)
+
+    def draw(self, alpha: float):
+        # render UI
+        self.ctx.draw(self.camera.screen)
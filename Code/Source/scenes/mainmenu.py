@@ -3,15 +3,16 @@
 import pygame
 
 from Source import ui
-from Source.scene import Scene
+from Source.scene import Menu, Scene
 from Source.scene_context import SceneContext
 from Source.profile import Profile
 
 from Source.scenes.level import Level
+from Source.scenes.loading import LoadingScene
 from Source.scenes.settings import SettingsScene
 
 
-class MainMenu(Scene):
+class MainMenu(Menu):
     def __init__(self, profile: Profile):
         super().__init__()
         self.profile = profile
@@ -38,13 +39,18 @@ class MainMenu(Scene):
             return Scene.Push(SettingsScene(self.profile))
         elif self.play:
             self.play = False
-            return Scene.Push(Level("level1.json", self.profile))
+            return Scene.Push(LoadingScene(Level("level1.json", self.profile, native=self.profile.native)))
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
 
+        if self.ctx.panel("main_menu", rect.size):
+            self._layout(rect)
+            self.ctx.end_panel()
+
+    def _layout(self, rect: pygame.Rect):
         # header
         head, body = ui.cut_top(rect, 100)
 
@@ -70,6 +76,6 @@ class MainMenu(Scene):
         # ui.cut_left(head, 10)
         # ui.cut_top(head, 50)
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
@@ -4,13 +4,13 @@ import pygame
 
 from Source import ui
 from Source.profile import Profile
-from Source.scene import Scene
+from Source.scene import Menu, Scene
 from Source.scene_context import SceneContext
 
 from Source.scenes.settings import SettingsScene
 
 
-class PauseMenu(Scene):
+class PauseMenu(Menu):
     def __init__(self, profile: Profile):
         super().__init__()
         self.profile = profile
@@ -50,9 +50,17 @@ class PauseMenu(Scene):
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def overlay(self) -> Scene.Overlay:
+        return Scene.Overlay(tint=pygame.Color(255, 255, 255, 160), blur=4)
+
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
 
+        if self.ctx.panel("pause_menu", rect.size):
+            self._layout(rect)
+            self.ctx.end_panel()
+
+    def _layout(self, rect: pygame.Rect):
         _, body = ui.cut_top(rect, 100)
         _, body = ui.cut_bottom(body, 100)
 
@@ -67,6 +75,6 @@ class PauseMenu(Scene):
         self.quit = self.ctx.button_layout(
             ui.center(quit), "Quit", self.assets.ARCADE_48)
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
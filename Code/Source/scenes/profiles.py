@@ -4,13 +4,13 @@ import pygame
 from Source import ui
 
 from Source.profile import Profile
-from Source.scene import Scene, SceneContext
+from Source.scene import Menu, Scene, SceneContext
 
 from Source.scenes.confirm_delete import ConfirmDelete
 from Source.scenes.mainmenu import MainMenu
 
 
-class ProfileScene(Scene):
+class ProfileScene(Menu):
     def __init__(self):
         super().__init__()
         self.profile = -1
@@ -42,9 +42,15 @@ class ProfileScene(Scene):
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
+        exists = [Profile.exists(f"Profile{i}.json") for i in range(1, 4)]
 
+        if self.ctx.panel("profiles", rect.size, *exists):
+            self._layout(rect, exists)
+            self.ctx.end_panel()
+
+    def _layout(self, rect: pygame.Rect, exists: list[bool]):
         # header
         head, body = ui.cut_top(rect, 75)
 
@@ -61,17 +67,16 @@ class ProfileScene(Scene):
         profiles = ui.hsplit_n(body, 3)
 
         for i in range(1, 4):
-            exists = Profile.exists(f"Profile{i}.json")
-            name = f"Profile  {i}" if exists else "NEW GAME"
+            name = f"Profile  {i}" if exists[i - 1] else "NEW GAME"
 
             top, bottom = ui.vsplit_n(profiles[i - 1], 2)
 
             if self.ctx.button_layout(ui.center(top), name, self.assets.ARCADE_24):
                 self.profile = i
 
-            if exists and self.ctx.button_layout(ui.center(bottom), "DELETE", self.assets.ARCADE_24, pygame.Color(255, 0, 0)):
+            if exists[i - 1] and self.ctx.button_layout(ui.center(bottom), "DELETE", self.assets.ARCADE_24, pygame.Color(255, 0, 0)):
                 self.remove = i
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
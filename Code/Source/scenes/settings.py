@@ -8,7 +8,7 @@ from Source import ui
 
 from Source.controls import Controls
 from Source.profile import Profile
-from Source.scene import Scene
+from Source.scene import Menu, Scene
 from Source.scene_context import SceneContext
 
 
@@ -30,7 +30,7 @@ class _Controls(Enum):
     POWERUP_2 = 6
 
 
-class SettingsScene(Scene):
+class SettingsScene(Menu):
     def __init__(self, profile: Profile):
         super().__init__()
         self.profile = profile
@@ -40,6 +40,7 @@ class SettingsScene(Scene):
         # UI state
         self.go_back = False
         self.listening = _Controls.NONE.value
+        self.toggling = False  # the native resolution button is held, it only toggles once
 
         self.color_table = [
             _Colors.IDLE,  # enter door
@@ -98,9 +99,17 @@ class SettingsScene(Scene):
 
         return Scene.Continue()
 
-    def update(self, dt: int):
+    def update(self, dt: float):
         rect = pygame.display.get_surface().get_rect()
 
+        state = (self.listening, tuple(self.color_table),
+                 tuple(self.profile.controls.list()), self.profile.bg, self.profile.sfx, self.profile.native)
+
+        if self.ctx.panel("settings", rect.size, *state):
+            self._layout(rect)
+            self.ctx.end_panel()
+
+    def _layout(self, rect: pygame.Rect):
         # header
         head, body = ui.cut_top(rect, 75)
 
@@ -171,7 +180,7 @@ class SettingsScene(Scene):
         if mapping(move_right, "Move  right", key.name(self.profile.controls.right)):
             self.listening = _Controls.RIGHT.value
 
-        jump, powerup_1, powerup_2, _ = ui.vsplit_n(right, 4)
+        jump, powerup_1, powerup_2, native = ui.vsplit_n(right, 4)
 
         if mapping(jump, "Jump", key.name(self.profile.controls.jump)):
             self.listening = _Controls.JUMP.value
@@ -182,6 +191,28 @@ class SettingsScene(Scene):
         if mapping(powerup_2, "Powerup  2", key.name(self.profile.controls.powerup_2)):
             self.listening = _Controls.POWERUP_2.value
 
+        # display
+        label, toggle = ui.hsplit_pct(native, 0.75)
+
+        ui.cut_top(label, 10)
+        ui.cut_left(label, 10)
+        ui.cut_right(label, 10)
+
+        self.ctx.text_layout(ui.center(label), "Native  res",
+                             self.assets.ARCADE_24)
+
+        ui.cut_top(toggle, 10)
+        ui.cut_left(toggle, 10)
+        ui.cut_right(toggle, 10)
+
+        pressed = self.ctx.button_layout(ui.center(toggle), "On" if self.profile.native else "Off", self.assets.ARCADE_24) \
+            and self.listening == -1
+
+        if pressed and not self.toggling:
+            self.profile.native = not self.profile.native
+
+        self.toggling = pressed
+
         if self.ctx.button_layout(ui.center(reset), "Reset", self.assets.ARCADE_24):
             defc = Controls.default()
             self.profile.controls.enter_door = defc.enter_door
@@ -196,6 +227,9 @@ class SettingsScene(Scene):
             self.profile.bg = 0.5
             self.profile.sfx = 0.5
 
+            # display
+            self.profile.native = False
+
         bg, sfx = ui.vsplit(sound)
 
         def volume_slider(rect: pygame.Rect, text: str, param: ui.Param[float]) -> bool:
@@ -238,6 +272,6 @@ class SettingsScene(Scene):
             # pygame.mixer.Sound.set_volume(self.profile.sfx)
             pass
 
-    def draw(self):
+    def draw(self, alpha: float):
         # render UI
         self.ctx.draw(self.camera.screen)
@@ -0,0 +1,143 @@
+from typing import Callable, Iterable, Iterator
+
+import pygame
+
+from Source.entity import Entity
+
+
+Cell = tuple[int, int]
+
+
+class SpatialHash:
+    """
+    A uniform grid broadphase.
+    Entities are inserted with a rect and stored in every cell the rect overlaps,
+    so only the entities sharing a cell with a rect need to be tested against it.
+    """
+
+    def __init__(self, cell_size: float):
+        """
+        Creates an empty spatial hash with square cells of the given size.
+        """
+        self.cell_size = cell_size
+
+        self.cells: dict[Cell, list[Entity]] = {}
+        self.rects: dict[Entity, pygame.Rect] = {}
+
+        # insertion order, so results come out in the order entities were added
+        self._order: dict[Entity, int] = {}
+        self._next = 0
+
+    def clear(self):
+        """
+        Removes every entity from the hash.
+        """
+        self.cells.clear()
+        self.rects.clear()
+        self._order.clear()
+        self._next = 0
+
+    def rebuild(self, entities: Iterable[Entity], bounds: Callable[[Entity], pygame.Rect]):
+        """
+        Replaces the contents of the hash with the given entities,
+        using `bounds` to get the rect of each one.
+        """
+        self.clear()
+
+        for entity in entities:
+            self.insert(entity, bounds(entity))
+
+    def insert(self, entity: Entity, rect: pygame.Rect):
+        """
+        Adds an entity with the given rect.
+        """
+        self.rects[entity] = rect
+        self._order[entity] = self._next
+        self._next += 1
+
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell, []).append(entity)
+
+    def remove(self, entity: Entity):
+        """
+        Removes an entity from the hash, if it was inserted.
+        """
+        rect = self.rects.pop(entity, None)
+        if rect is None:
+            return
+
+        del self._order[entity]
+
+        for cell in self._cells(rect):
+            bucket = self.cells[cell]
+            bucket.remove(entity)
+
+            if not bucket:
+                del self.cells[cell]
+
+    def update(self, entity: Entity, rect: pygame.Rect):
+        """
+        Moves an entity to the given rect, only touching the cells if they changed.
+        """
+        old = self.rects.get(entity)
+        if old is None:
+            self.insert(entity, rect)
+            return
+
+        if self._span(old) != self._span(rect):
+            order = self._order[entity]
+            self.remove(entity)
+            self.insert(entity, rect)
+            self._order[entity] = order
+
+        self.rects[entity] = rect
+
+    def query_rect(self, rect: pygame.Rect) -> list[Entity]:
+        """
+        Returns the entities sharing a cell with the given rect, in insertion order.
+        These are only candidates, their rects still have to be tested for collision.
+        """
+        found: dict[Entity, None] = {}
+
+        for cell in self._cells(rect):
+            for entity in self.cells.get(cell, ()):
+                found[entity] = None
+
+        return sorted(found, key=self._order.__getitem__)
+
+    def pairs(self) -> Iterator[tuple[Entity, Entity]]:
+        """
+        Yields every pair of entities sharing at least one cell, once.
+        These are only candidates, their rects still have to be tested for collision.
+        """
+        seen: set[tuple[int, int]] = set()
+
+        for bucket in self.cells.values():
+            for i, a in enumerate(bucket):
+                for b in bucket[i + 1:]:
+                    first, second = (a, b) if self._order[a] < self._order[b] else (b, a)
+
+                    key = (self._order[first], self._order[second])
+                    if key not in seen:
+                        seen.add(key)
+                        yield first, second
+
+    def _span(self, rect: pygame.Rect) -> tuple[int, int, int, int]:
+        """
+        Returns the first and last cell coordinates covered by the rect.
+        """
+        size = self.cell_size
+
+        return (
+            int(rect.left // size), int(rect.top // size),
+            # a rect with no area still lives in its top-left cell
+            int(max(rect.left, rect.right - 1) // size),
+            int(max(rect.top, rect.bottom - 1) // size),
+        )
+
+    def _cells(self, rect: pygame.Rect) -> Iterator[Cell]:
+        minx, miny, maxx, maxy = self._span(rect)
+
+        for y in range(miny, maxy + 1):
+            for x in range(minx, maxx + 1):
+                yield (x, y)
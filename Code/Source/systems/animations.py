@@ -4,7 +4,7 @@ from Source.entity_list import EntityList
 
 
 
-def update_animations(entities: EntityList, dt: int):
+def update_animations(entities: EntityList, dt: float):
     for anim in entities.query(Animator).types():
         anim.elapsed += dt
         if anim.anims[anim.active].duration >= anim.elapsed and anim.anims[anim.active].loop:
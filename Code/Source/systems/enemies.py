@@ -19,7 +19,7 @@ class PatrolRange(Component):
     """
     length: int
     duration: int
-    elapsed: int = 0
+    elapsed: float = 0
     left: bool = False
 
 
@@ -50,7 +50,7 @@ class PatrolRange(Component):
 #             obj.add(Active())
 
 
-def update_enemies(entities: EntityList, dt: int):
+def update_enemies(entities: EntityList, dt: float):
     """
     A system that handles enemies.
     """
@@ -1,4 +1,3 @@
-
 from Source.components import Velocity
 from Source.entity_list import EntityList
 
@@ -8,5 +7,10 @@ def gravity(entities: EntityList):
     """
     A system that handles gravity.
     """
+    if entities.columns is not None:
+        store = entities.columns
+        store.column(Velocity)[store.mask(Velocity), 1] += GRAVITY
+        return
+
     for vel in entities.query(Velocity).types():
-        vel.y += GRAVITY
\ No newline at end of file
+        vel.y += GRAVITY
@@ -1,23 +1,97 @@
-
 import pygame
+import numpy as np
 
 from math import ceil
 
+from Source.column_store import ColumnStore
 from Source.components import *
 from Source.entity_list import EntityList
 
 
-from Source.tilemap import TileId
+from Source.tilemap import SOLID, TileId
 from Source.systems.player import Player
 
 
-def update_physics(entities: EntityList, dt: int, *,
+def _clamp(a, b, x): return min(b, max(a, x))
+
+
+def solid_tiles(tiles: np.ndarray, map_w: int, map_h: int, flags: np.ndarray | None = None) -> np.ndarray:
+    """
+    Returns a (map_h, map_w) grid which is True where the tile is solid according to `flags`
+    (see Tileset.flags), or where it is not empty without them.
+    The tiles missing from the tileset are solid.
+    """
+    grid = np.asarray(tiles)[:map_w * map_h].reshape(map_h, map_w)
+
+    if flags is None:
+        return grid != 0
+
+    solid = (np.take(flags, grid, mode="clip") & SOLID) != 0
+    solid |= grid >= len(flags)
+
+    return solid
+
+
+def _collide_tiles(pos: Position, vel: Velocity, size: Size, coll: Collider, *,
+                   tile_size: tuple[int, int],
+                   solid: np.ndarray,
+                   map_w: int, map_h: int) -> tuple[int, int]:
+    """
+    Stops the entity from falling through the tiles below it.
+    Returns the size of the entity's collider in tiles.
+    """
+    box = coll.area
+
+    diff = (
+        int(ceil(box.w // tile_size[0])), int(ceil(box.h / tile_size[1])))
+
+    minx, miny = int(pos.x + box.x /
+                     size.w), int(pos.y + box.y / size.h)
+    maxx, maxy = int(ceil(pos.x + box.x / size.w +
+                     diff[0])), int(ceil(pos.y + box.y / size.h + diff[1]))
+
+    area = pygame.Rect(
+        (pos.x + box.x / size.w) * tile_size[0],
+        (pos.y + box.y / size.h) * tile_size[1],
+        box.w,
+        box.h,
+    )
+
+    # NOTE: -1/+1 is to check the tiles next to the player
+    minx = _clamp(0, map_w - 1, minx)
+    # TODO: we only need to check the bottom right corner, right?
+    miny = _clamp(0, map_h - 1, maxy)
+    maxx = _clamp(0, map_w - 1, maxx)
+    maxy = _clamp(0, map_h - 1, maxy)
+
+    for i in range(minx, maxx):
+        if solid[maxy, i] and pos.y + diff[1] > maxy and area.colliderect(i * tile_size[0], maxy * tile_size[1], tile_size[0], tile_size[1]):
+            vel.y = min(0, vel.y)
+            # pos.y = ((maxy - 1) * tile_size[1] - coll.area.h) / tile_size[1]
+            # break
+
+    return diff
+
+
+def update_physics(entities: EntityList, dt: float, *,
                    tile_size: tuple[int, int],
                    tiles: list[TileId],
-                   map_w: int, map_h: int):
+                   map_w: int, map_h: int,
+                   flags: np.ndarray | None = None,
+                   solid: np.ndarray | None = None):
     """
     A system that handles physics.
+    `solid` (see `solid_tiles`) is the collision grid, made from the tiles and their `flags` if not given.
+    If the entities have a column store, all of them are resolved at once.
     """
+    if solid is None:
+        solid = solid_tiles(tiles, map_w, map_h, flags)
+
+    if entities.columns is not None:
+        _update_physics_columns(
+            entities.columns, dt,
+            tile_size=tile_size, solid=solid)
+        return
 
     # physics
     for obj in entities.query(Position, Velocity, Size).ids():
@@ -27,43 +101,111 @@ def update_physics(entities: EntityList, dt: int, *,
         coll = obj.get(Collider) or Collider(
             area=pygame.Rect(0, 0, size.w, size.h))
 
-        diff = (
-            int(ceil(coll.area.w // tile_size[0])), int(ceil(coll.area.h / tile_size[1])))
-
-        minx, miny = int(pos.x + coll.area.x /
-                         size.w), int(pos.y + coll.area.y / size.h)
-        maxx, maxy = int(ceil(pos.x + coll.area.x / size.w +
-                         diff[0])), int(ceil(pos.y + coll.area.y / size.h + diff[1]))
-
-        area = pygame.Rect(
-            (pos.x + coll.area.x / size.w) * tile_size[0],
-            (pos.y + coll.area.y / size.h) * tile_size[1],
-            coll.area.w,
-            coll.area.h,
-        )
-
-        def clamp(a, b, x): return min(b, max(a, x))
-
-        # NOTE: -1/+1 is to check the tiles next to the player
-        minx = clamp(0, map_w - 1, minx)
-        # TODO: we only need to check the bottom right corner, right?
-        miny = clamp(0, map_h - 1, maxy)
-        maxx = clamp(0, map_w - 1, maxx)
-        maxy = clamp(0, map_h - 1, maxy)
-
-        for i in range(minx, maxx):
-            if tiles[maxy * map_w + i] != 0 and pos.y + diff[1] > maxy and area.colliderect(i * tile_size[0], maxy * tile_size[1], tile_size[0], tile_size[1]):
-                vel.y = min(0, vel.y)
-                # pos.y = ((maxy - 1) * tile_size[1] - coll.area.h) / tile_size[1]
-                # break
+        diff = _collide_tiles(
+            pos, vel, size, coll,
+            tile_size=tile_size, solid=solid, map_w=map_w, map_h=map_h)
 
         pos.x += vel.x * (dt / 1000)
         pos.y += vel.y * (dt / 1000)
 
-        pos.x = clamp(0, map_w - diff[0], pos.x)
+        pos.x = _clamp(0, map_w - diff[0], pos.x)
         # TODO: this should be clamped to the floor
-        pos.y = clamp(0, map_h, pos.y)
+        pos.y = _clamp(0, map_h, pos.y)
 
         # friction
         vel.x *= 0.9
         vel.y *= 0.9
+
+
+def _collide_tiles_batch(pos: np.ndarray, vel: np.ndarray, size: np.ndarray, coll: np.ndarray, *,
+                         tile_size: tuple[int, int],
+                         solid: np.ndarray) -> np.ndarray:
+    """
+    Same as `_collide_tiles`, for every row of the given arrays at once.
+    Updates `vel` in place and returns the width of each collider in tiles.
+    """
+    map_h, map_w = solid.shape
+    tw, th = tile_size
+
+    cx, cy = coll[:, 0], coll[:, 1]
+    # pygame truncates the sizes to ints
+    cw, ch = np.trunc(coll[:, 2]), np.trunc(coll[:, 3])
+
+    diffx = np.ceil(cw // tw).astype(np.int64)
+    diffy = np.ceil(ch / th).astype(np.int64)
+
+    left = pos[:, 0] + cx / size[:, 0]
+    top = pos[:, 1] + cy / size[:, 1]
+
+    minx = np.trunc(left).astype(np.int64)
+    maxx = np.ceil(left + diffx).astype(np.int64)
+    maxy = np.ceil(top + diffy).astype(np.int64)
+
+    ax = np.trunc(left * tw)
+    ay = np.trunc(top * th)
+
+    minx = np.clip(minx, 0, map_w - 1)
+    maxx = np.clip(maxx, 0, map_w - 1)
+    maxy = np.clip(maxy, 0, map_h - 1)
+
+    # every entity checks the tiles [minx, maxx) on the row maxy
+    span = int((maxx - minx).max(initial=0))
+    cols = minx[:, None] + np.arange(span)
+    valid = cols < maxx[:, None]
+    cols = np.minimum(cols, map_w - 1)
+
+    bx = cols * tw
+    by = (maxy * th)[:, None]
+
+    # same as pygame.Rect.colliderect, zero sized rects never collide
+    hit = (
+        valid
+        & solid[maxy[:, None], cols]
+        & (pos[:, 1] + diffy > maxy)[:, None]
+        & ((cw != 0) & (ch != 0))[:, None]
+        & (np.minimum(ax, ax + cw)[:, None] < np.maximum(bx, bx + tw))
+        & (np.maximum(ax, ax + cw)[:, None] > np.minimum(bx, bx + tw))
+        & (np.minimum(ay, ay + ch)[:, None] < np.maximum(by, by + th))
+        & (np.maximum(ay, ay + ch)[:, None] > np.minimum(by, by + th))
+    ).any(axis=1)
+
+    vel[hit, 1] = np.minimum(0, vel[hit, 1])
+
+    return diffx
+
+
+def _update_physics_columns(store: ColumnStore, dt: float, *,
+                            tile_size: tuple[int, int],
+                            solid: np.ndarray):
+    """
+    Same as `update_physics`, but resolves all the entities of the column store at once.
+    """
+    mask = store.mask(Position, Velocity, Size)
+
+    pos = store.column(Position)[mask]
+    vel = store.column(Velocity)[mask]
+    size = store.column(Size)[mask]
+
+    # entities without a collider use their whole size
+    coll = np.column_stack((np.zeros_like(size), np.trunc(size)))
+
+    if store.stores(Collider):
+        has = store.mask(Collider)[mask]
+        coll[has] = store.column(Collider)[mask][has]
+
+    diffx = _collide_tiles_batch(
+        pos, vel, size, coll, tile_size=tile_size, solid=solid)
+
+    map_h, map_w = solid.shape
+
+    pos += vel * (dt / 1000)
+
+    pos[:, 0] = np.minimum(map_w - diffx, np.maximum(0, pos[:, 0]))
+    # TODO: this should be clamped to the floor
+    pos[:, 1] = np.minimum(map_h, np.maximum(0, pos[:, 1]))
+
+    # friction
+    vel *= 0.9
+
+    store.column(Position)[mask] = pos
+    store.column(Velocity)[mask] = vel
@@ -8,6 +8,7 @@ from Source.components import *
 from Source.entity import Entity
 from Source.entity_list import EntityList
 from Source.controls import Controls
+from Source.spatial_hash import SpatialHash
 
 
 class Player(Component):
@@ -70,7 +71,7 @@ class Shield(Component):
 ACCEL = (0.5, 60)
 
 
-def update_player(entities: EntityList, dt: int, *,
+def update_player(entities: EntityList, dt: float, *,
                   key: int, controls: Controls):
     """
     A system that handles player logic.
@@ -105,24 +106,52 @@ def update_player(entities: EntityList, dt: int, *,
         vel.x = max(-10, min(10, vel.x))
 
 
-def handle_player_collisions(entities: EntityList, tile_size: tuple[int, int]):
+POWERUP_CELL = 4
+"""
+The size of the spatial hash cells used for powerup collisions, in tiles.
+"""
+
+
+def _tile_rect(e: Entity, tile_size: tuple[int, int]) -> pygame.Rect:
+    pos = e.unsafe_get(Position)
+    size = e.unsafe_get(Size)
+
+    return pygame.Rect(pos.x, pos.y, size.w //
+                       tile_size[0], size.h // tile_size[1])
+
+
+def track_powerups(entities: EntityList, tile_size: tuple[int, int], powerups: SpatialHash):
+    """
+    Fills the hash with the powerups that can be picked up, for `handle_player_collisions`.
+    Called when objects come or go, the hash follows them as they fall and are picked up.
+    """
+    powerups.rebuild(
+        entities.query(Powerup, Name, Position, Size, Active).ids(),
+        lambda pu: _tile_rect(pu, tile_size),
+    )
+
+
+def handle_player_collisions(entities: EntityList, tile_size: tuple[int, int], powerups: SpatialHash):
+    # only the powerups still falling moved since the last update
+    for pu in entities.query(Powerup, Velocity, Active).ids():
+        vel = pu.unsafe_get(Velocity)
+
+        if vel.x or vel.y:
+            powerups.update(pu, _tile_rect(pu, tile_size))
+
     for p in entities.query(Player).ids():
-        pos = p.unsafe_get(Position)
-        size = p.unsafe_get(Size)
+        prect = _tile_rect(p, tile_size)
 
-        prect = pygame.Rect(pos.x, pos.y, size.w //
-                            tile_size[0], size.h // tile_size[1])
+        for pu in powerups.query_rect(prect):
+            # might have been picked up by another player already
+            if not pu.has(Active):
+                continue
 
-        for pu in entities.query(Powerup, Name, Position, Size, Active).ids():
-            pos = pu.unsafe_get(Position)
-            size = pu.unsafe_get(Size)
             pu_name = pu.unsafe_get(Name).name
 
-            rect = pygame.Rect(pos.x, pos.y, size.w //
-                               tile_size[0], size.h // tile_size[1])
-
-            if prect.colliderect(rect):
+            if prect.colliderect(powerups.rects[pu]):
                 pu.remove(Active)
+                powerups.remove(pu)
 
                 if not p.has(Powerup1):
                     p.add(Powerup1(pu_name))
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+import pygame
+
+from Source.font_cache import FontCache, FontId
+
+
+DEFAULT_SIZE = 24
+
+_Key = tuple[FontId, str, tuple[int, int, int, int], bool]
+
+
+class TextCache:
+    """
+    Keeps the surfaces of recently rendered strings, so drawing the same text
+    every frame only rasterizes it once.
+    Once more than `capacity` strings are cached, the least recently used ones are dropped.
+    """
+
+    def __init__(self, fonts: FontCache, capacity: int = 512):
+        """
+        Creates an empty text cache rendering with the fonts of the given font cache.
+        """
+        self.fonts = fonts
+        self.capacity = capacity
+
+        self.surfaces: OrderedDict[_Key, pygame.Surface] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+        # used when no font is given, loaded once instead of on every call
+        self.default = fonts.load_system(DEFAULT_SIZE)
+
+    def render(
+            self,
+            uid: FontId | None, text: str,
+            color: pygame.Color, antialias: bool = False) -> pygame.Surface:
+        """
+        Returns the text rendered with the given font, or the default one if the font is missing.
+        The surface is shared, it must not be modified.
+        """
+        if uid is None or self.fonts.get(uid) is None:
+            uid = self.default
+
+        key = (uid, text, tuple(color), antialias)
+
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+
+        surf = self.fonts.unsafe_get(uid).render(text, antialias, color)
+        self.surfaces[key] = surf
+
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+
+        return surf
+
+    def clear(self):
+        """
+        Drops every cached surface and resets the counters.
+        """
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
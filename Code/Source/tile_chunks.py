@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from Source.camera import Camera
+from Source.image_cache import ImageCache
+from Source.tilemap import NULL_TILE, TileMap
+
+
+class TileChunks:
+    """
+    The static tile layer of a map, pre-rendered into chunks of `size` x `size` tiles.
+    A chunk is baked the first time it is seen at a given scale, so drawing the layer
+    only costs one blit per chunk overlapping the camera.
+    Once more than `budget` chunks are baked, the least recently drawn ones are dropped.
+    """
+
+    def __init__(self, tilemap: TileMap, images: ImageCache, size: int = 16, budget: int = 64):
+        self.map = tilemap
+        self.images = images
+        self.size = size
+        self.budget = budget
+
+        self.scale: float | None = None
+        self.tileset: pygame.Surface | None = None  # the tileset image, at `scale`
+
+        # (chunk x, chunk y) -> surface, or None if the chunk has no tiles
+        self.chunks: OrderedDict[tuple[int, int], pygame.Surface | None] = OrderedDict()
+
+    def render(self, camera: Camera, scale: float, layer: int = 0):
+        """
+        Submits the chunks overlapping the camera to its render queue, baking the missing ones.
+        """
+        if scale != self.scale:
+            self._rescale(scale)
+
+        # only the chunks holding the visible tiles are touched, the margin
+        # covers the tiles that spill a pixel past their cell
+        minx, miny, maxx, maxy = self.map.tile_range(camera.area, scale)
+
+        for cy in range(miny // self.size, (maxy - 1) // self.size + 1):
+            for cx in range(minx // self.size, (maxx - 1) // self.size + 1):
+                key = (cx, cy)
+
+                if key in self.chunks:
+                    self.chunks.move_to_end(key)
+                else:
+                    self.chunks[key] = self._bake(cx, cy)
+
+                    if len(self.chunks) > self.budget:
+                        self.chunks.popitem(last=False)
+
+                chunk = self.chunks[key]
+                if chunk is not None:
+                    camera.submit(chunk, self._origin(cx, cy), layer=layer)
+
+    def invalidate(self, tiles: tuple[int, int, int, int] | None = None):
+        """
+        Drops the baked chunks, e.g. after the tiles have changed.
+        With `tiles`, as (min x, min y, max x, max y) with the max excluded, only the chunks holding them.
+        """
+        if tiles is None:
+            self.chunks.clear()
+            return
+
+        minx, miny, maxx, maxy = tiles
+
+        for cy in range(miny // self.size, (maxy - 1) // self.size + 1):
+            for cx in range(minx // self.size, (maxx - 1) // self.size + 1):
+                self.chunks.pop((cx, cy), None)
+
+    def _rescale(self, scale: float):
+        self.scale = scale
+        self.tileset = pygame.transform.scale_by(
+            self.images.unsafe_get(self.map.tileset.image), scale)
+        self.chunks.clear()
+
+    def _origin(self, cx: int, cy: int) -> tuple[int, int]:
+        """
+        Returns where the chunk is drawn, in pixels.
+        """
+        tw, th = self.map.tileset.tile_size
+        scale = self.scale or 1
+
+        return (
+            int(tw * cx * self.size * scale),
+            int(th * cy * self.size * scale),
+        )
+
+    def _bake(self, cx: int, cy: int) -> pygame.Surface | None:
+        tw, th = self.map.tileset.tile_size
+        scale = self.scale or 1
+        ox, oy = self._origin(cx, cy)
+
+        w, h = self.map.width, self.map.height
+        grid = self.map.tiles[:w * h].reshape(h, w)
+
+        x0, y0 = cx * self.size, cy * self.size
+        block = grid[y0:y0 + self.size, x0:x0 + self.size]
+
+        blits = []
+
+        table = self.map.tileset.rects
+
+        # only the non-empty cells the tileset knows, with their source rects looked up all at once
+        js, is_ = np.nonzero((block != NULL_TILE) & (block < len(table)))
+        rects = table[block[js, is_]].tolist()
+
+        for j, i, (x, y, rw, rh) in zip((js + y0).tolist(), (is_ + x0).tolist(), rects):
+            area = pygame.Rect(x * scale, y * scale, rw * scale, rh * scale)
+
+            dst = (
+                int(tw * i * scale) - ox,
+                int(th * j * scale) - oy,
+            )
+
+            blits.append((self.tileset, dst, area))
+
+        if not blits:
+            return None
+
+        w = max(dst[0] + area.w for _, dst, area in blits)
+        h = max(dst[1] + area.h for _, dst, area in blits)
+
+        chunk = pygame.Surface((w, h), pygame.SRCALPHA)
+        chunk.blits(blits, doreturn=False)
+
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert_alpha()
+
+        return chunk
@@ -1,12 +1,17 @@
 
 from dataclasses import dataclass
 import json
+import os
 from typing import Any, Callable, NewType
 
+import numpy as np
+
+from Source.asset_loader import AssetLoader
 from Source.components import *
 from Source.entity import Component, Entity
 from Source.entity_list import EntityList
 from Source.image_cache import ImageCache, TextureId
+from Source import wamap
 
 
 """
@@ -42,6 +47,12 @@ NULL_TILE = 0
     The null tile is a tile that is always empty.
 """
 
+SOLID = 1
+"""
+    Flag of the tiles entities can't go through, every tile but the null one
+    unless its "solid" property is "false".
+"""
+
 
 PropertyParser = Callable[[str, Any], Component]
 """
@@ -63,16 +74,120 @@ class Tile:
     properties: dict[str, str]
 
 
-@dataclass
+@dataclass(frozen=True)
 class Tileset:
     """
         A tileset is a collection of tiles.
+        It is shared by every map using it, so it must not be modified.
     """
     name: str
     image: TextureId
     tile_size: tuple[int, int]
     colorkey: tuple[int, int, int] | None
     tiles: dict[TileId, Tile]
+    rects: np.ndarray
+    """
+        (x, y, w, h) of each tile in the tileset image, indexed by tile id.
+    """
+    flags: np.ndarray
+    """
+        Flags of each tile, like SOLID, indexed by tile id.
+    """
+
+    @staticmethod
+    def lookup(tiles: dict[TileId, Tile], tile_size: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        """
+            Returns the dense `rects` and `flags` tables of the given tiles.
+        """
+        count = max(tiles, default=NULL_TILE) + 1
+
+        rects = np.zeros((count, 4), dtype=np.int32)
+        flags = np.zeros(count, dtype=np.uint8)
+
+        for tid, tile in tiles.items():
+            rects[tid] = (*tile.offset, *tile_size)
+
+            if tid != NULL_TILE and tile.properties.get("solid") != "false":
+                flags[tid] |= SOLID
+
+        rects.flags.writeable = False
+        flags.flags.writeable = False
+
+        return rects, flags
+
+    @staticmethod
+    def parse(data: dict[str, Any], images: ImageCache) -> "Tileset":
+        """
+            Builds a tileset from the content of a tileset file.
+        """
+        tiles = {
+            TileId(int(tile["tid"])): Tile(
+                offset=tile["offset"],
+                properties=tile.get("properties", {})
+            )
+            for tile in data["tiles"]
+        }
+        rects, flags = Tileset.lookup(tiles, data["tile_size"])
+
+        return Tileset(
+            name=data["name"],
+            image=images.load(data["image"]),
+            tile_size=data["tile_size"],
+            colorkey=data.get("colorkey", None),
+            tiles=tiles,
+            rects=rects,
+            flags=flags,
+        )
+
+
+class TilesetRegistry:
+    """
+        Parses each tileset file once, and shares the Tileset between every map using it.
+        A tileset is parsed again when its file was modified since.
+    """
+
+    def __init__(self, images: ImageCache, loader: AssetLoader | None = None):
+        """
+            Creates an empty registry, whose tilesets load their images in the given image cache.
+        """
+        self.images = images
+        self.loader = loader
+
+        # path -> (modification time of the file, tileset)
+        self.tilesets: dict[str, tuple[int, Tileset]] = {}
+
+    def get(self, path: str) -> Tileset:
+        """
+            Returns the tileset stored at the given path, parsing it if needed.
+        """
+        mtime = os.stat(path).st_mtime_ns
+
+        cached = self.tilesets.get(path)
+        if cached is not None:
+            if cached[0] == mtime:
+                return cached[1]
+
+            self.invalidate(path)
+
+        if self.loader is not None:
+            data = self.loader.json(path).result()
+        else:
+            with open(path, "r") as f:
+                data = json.load(f)
+
+        tileset = Tileset.parse(data, self.images)
+        self.tilesets[path] = (mtime, tileset)
+
+        return tileset
+
+    def invalidate(self, path: str):
+        """
+            Drops the tileset stored at the given path, so it is parsed again the next time.
+        """
+        self.tilesets.pop(path, None)
+
+        if self.loader is not None:
+            self.loader.forget(path)
 
 
 @dataclass
@@ -85,9 +200,28 @@ class TileMap:
     width: int
     height: int
     tileset: Tileset
-    tiles: list[TileId]
+    tiles: np.ndarray
+    """
+        The tile ids as uint16, row by row.
+    """
     objects: EntityList
 
+    def tile_range(self, area: Rect, scale: float, margin: int = 1) -> tuple[int, int, int, int]:
+        """
+            Returns the tiles overlapping the given area in pixels, when tiles are drawn `scale` times bigger,
+            as (min x, min y, max x, max y) with the max excluded.
+            `margin` more tiles are included on every side, to tolerate scrolling.
+        """
+        tw = self.tileset.tile_size[0] * scale
+        th = self.tileset.tile_size[1] * scale
+
+        return (
+            max(0, int(area.left // tw) - margin),
+            max(0, int(area.top // th) - margin),
+            min(self.width, int((area.right - 1) // tw) + 1 + margin),
+            min(self.height, int((area.bottom - 1) // th) + 1 + margin),
+        )
+
     @staticmethod
     def __default_property_parser(name: str, value: str) -> Component:
         """
@@ -96,63 +230,81 @@ class TileMap:
         return Tag(name)
 
     @staticmethod
-    def load(file: str, images: ImageCache, parser: PropertyParser = __default_property_parser) -> "TileMap":
-        """
-            Load a tile map from a file.
-        """
-        with open(file, "r") as handle:
-            data = json.load(handle)
-
-            img = data.get("background", None)
-            bg = images.load(img)
-
-            f = open("./Resources/Maps/" + data["tileset"], "r")
-            ts = json.load(f)
-            f.close()  # close the file to avoid any leaks
-
-            return TileMap(
-                name=data["name"],
-                background=bg,
-                width=len(data["tiles"]) // int(data["height"]),
-                height=int(data["height"]),
-                tileset=Tileset(
-                    name=ts["name"],
-                    image=images.load(ts["image"]),
-                    tile_size=ts["tile_size"],
-                    colorkey=ts.get("colorkey", None),
-                    tiles={
-                        TileId(int(tile["tid"])): Tile(
-                            offset=tile["offset"],
-                            properties=tile.get("properties", {})
-                        )
-                        for tile in ts["tiles"]
-                    }
-                ),
-                tiles=[
-                    TileId(int(tile)) for tile in data["tiles"]
-                ],
-                objects=EntityList(
-                    Entity([
-                        Position(
-                            x=float(obj["offset"]["x"]),
-                            y=float(obj["offset"]["y"]),
-                        ),
-                        Size(
-                            w=int(obj["area"][2]),
-                            h=int(obj["area"][3]),
-                        ),
-                        Sprite(
-                            rect=Rect(
-                                int(obj["area"][0] * obj["area"][2]),
-                                int(obj["area"][1] * obj["area"][3]),
-                                int(obj["area"][2]),
-                                int(obj["area"][3]),
-                            ),
-                            uid=images.load(obj["image"]),
-                        )] +
-                        [parser(name, value)
-                         for name, value in obj.get("properties", {}).items()]
-                    )
-                    for obj in data.get("objects", [])
-                )
+    def load(file: str, images: ImageCache, parser: PropertyParser = __default_property_parser,
+             loader: AssetLoader | None = None, tilesets: TilesetRegistry | None = None) -> "TileMap":
+        """
+            Load a tile map from a file, either JSON or compiled (.wamap).
+            With a loader, the files are parsed by it, or taken from it if they already were.
+            With a registry, the tileset is taken from it instead of being parsed for this map.
+        """
+        if loader is not None:
+            data = loader.map(file).result()
+        elif file.endswith(".wamap"):
+            data = wamap.read(file)
+        else:
+            with open(file, "r") as handle:
+                data = json.load(handle)
+
+        tileset = TileMap.load_tileset("./Resources/Maps/" + data["tileset"], images, loader, tilesets)
+
+        img = data.get("background", None)
+        bg = images.load(img)
+
+        return TileMap(
+            name=data["name"],
+            background=bg,
+            width=len(data["tiles"]) // int(data["height"]),
+            height=int(data["height"]),
+            tileset=tileset,
+            # compiled maps keep their tiles in the mapped file
+            tiles=np.asarray(data["tiles"], dtype=np.uint16),
+            objects=EntityList(
+                TileMap.load_object(obj, images, parser)
+                for obj in data.get("objects", [])
             )
+        )
+
+    @staticmethod
+    def load_tileset(path: str, images: ImageCache, loader: AssetLoader | None = None,
+                     tilesets: TilesetRegistry | None = None) -> Tileset:
+        """
+            Loads the tileset at the given path, or takes it from the registry if given.
+        """
+        if tilesets is not None:
+            return tilesets.get(path)
+
+        if loader is not None:
+            return Tileset.parse(loader.json(path).result(), images)
+
+        f = open(path, "r")
+        tileset = Tileset.parse(json.load(f), images)
+        f.close()  # close the file to avoid any leaks
+
+        return tileset
+
+    @staticmethod
+    def load_object(obj: dict[str, Any], images: ImageCache, parser: PropertyParser) -> Entity:
+        """
+            Creates the entity of an object of a map file.
+        """
+        return Entity([
+            Position(
+                x=float(obj["offset"]["x"]),
+                y=float(obj["offset"]["y"]),
+            ),
+            Size(
+                w=int(obj["area"][2]),
+                h=int(obj["area"][3]),
+            ),
+            Sprite(
+                rect=Rect(
+                    int(obj["area"][0] * obj["area"][2]),
+                    int(obj["area"][1] * obj["area"][3]),
+                    int(obj["area"][2]),
+                    int(obj["area"][3]),
+                ),
+                uid=images.load(obj["image"]),
+            )] +
+            [parser(name, value)
+             for name, value in obj.get("properties", {}).items()]
+        )
@@ -1,12 +1,14 @@
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Generic, TypeVar
 
 import pygame
 
 from Source.font_cache import FontCache, FontId
+from Source.glyph_atlas import GlyphAtlas
 from Source.image_cache import ImageCache, TextureId
+from Source.text_cache import TextCache
 
 # IDEA:
 # you can avoid passing the rect to every widget by storing the rect inside the context
@@ -263,8 +265,17 @@ class _DrawRect:
 
 @dataclass
 class _DrawText:
-    text: pygame.Surface  # FIXME: this should ideally be a unique ID
+    text: pygame.Surface = field(compare=False)
     rect: pygame.Rect
+    key: tuple = ()  # what the text was rendered from, compared instead of the surface
+
+
+@dataclass
+class _DrawGlyphs:
+    rect: pygame.Rect
+    size: tuple[int, int]  # of the text, which may overflow the rect
+    blits: list = field(compare=False)  # see GlyphAtlas.layout
+    key: tuple = ()  # what the glyphs were laid out from, compared instead of the blits
 
 
 @dataclass
@@ -274,7 +285,7 @@ class _DrawImage:
     crop: pygame.Rect | None = None
 
 
-_Command = _DrawRect | _DrawText | _DrawImage
+_Command = _DrawRect | _DrawText | _DrawGlyphs | _DrawImage
 
 
 class _Mouse:
@@ -306,9 +317,27 @@ class Context:
         self._images = images
         self._fonts = fonts
 
+        self.texts = TextCache(fonts)
+
+        # fonts whose text is drawn from a glyph atlas rather than rendered, see `use_atlas`
+        self.atlases: dict[FontId, GlyphAtlas] = {}
+
         self._commands: list[_Command] = []
+        self._drawn: list[_Command] = []  # the widgets as of the last call to `draw`
         self._mouse = _Mouse()
 
+        # retained panels, id -> (inputs, widgets)
+        self._panels: dict[str, tuple[tuple, list[_Command]]] = {}
+        self._recording: tuple[str, tuple, int] | None = None
+
+    def use_atlas(self, uid: FontId):
+        """
+        Draws the text of the given font from a glyph atlas, rather than rendering every string once.
+        Meant for bitmap fonts, which are drawn without antialiasing.
+        """
+        if uid not in self.atlases:
+            self.atlases[uid] = GlyphAtlas(self._fonts.unsafe_get(uid))
+
     def feed(self, event: pygame.event.Event):
         """
         Feeds an event to the context.
@@ -367,16 +396,21 @@ class Context:
         """
         Draws text at the given rect. If no font is specified, a default one is used.
         """
-        font = self._fonts.get(uid) if uid is not None else None
-        if font is None:
-            font = pygame.font.Font(None, 24)
+        atlas = self._atlas(uid, text)
 
-        surf = font.render(text, False, color)
-        # area, _ = cut_left(rect, surf.get_rect().w)
+        if atlas is not None:
+            size = atlas.size(text)
+            area = pygame.Rect(rect.topleft, size)
+            self._commands.append(
+                _DrawGlyphs(area, size, atlas.layout(text, color, area.topleft), (uid, text, color)))
+        else:
+            surf = self.texts.render(uid, text, color)
+            # area, _ = cut_left(rect, surf.get_rect().w)
+
+            # pygame.draw.rect(pygame.display.get_surface(), (255, 0, 0), textpos, 1)
+            area = surf.get_rect().move(rect.left, rect.top)
+            self._commands.append(_DrawText(surf, area, (uid, text, color)))
 
-        # pygame.draw.rect(pygame.display.get_surface(), (255, 0, 0), textpos, 1)
-        area = surf.get_rect().move(rect.left, rect.top)
-        self._commands.append(_DrawText(surf, area))
         cut_left(rect, area.w)
 
         return area
@@ -389,16 +423,21 @@ class Context:
         """
         Draws text with the given layout. If no font is specified, a default one is used.
         """
-        font = self._fonts.get(uid) if uid is not None else None
-        if font is None:
-            font = pygame.font.Font(None, 24)
+        atlas = self._atlas(uid, text)
+
+        if atlas is not None:
+            size = atlas.size(text)
+            area, _ = rectcut(layout.rect, size[0], layout.direction)
+            self._commands.append(
+                _DrawGlyphs(area, size, atlas.layout(text, color, area.topleft), (uid, text, color)))
+            return area
 
-        surf = font.render(text, False, color)
+        surf = self.texts.render(uid, text, color)
 
         area, _ = rectcut(layout.rect, surf.get_rect().w, layout.direction)
 
         # pygame.display.get_surface().blit(surf, textpos)
-        self._commands.append(_DrawText(surf, area))
+        self._commands.append(_DrawText(surf, area, (uid, text, color)))
 
         return area
 
@@ -468,26 +507,129 @@ class Context:
 
         return False
 
+    def progress(
+            self,
+            rect: pygame.Rect, pct: float,
+            color: pygame.Color = pygame.Color(0, 0, 0)):
+        """
+        Draws a progress bar at the given rect, filled to `pct` from 0 to 1.
+        """
+        self._commands.append(_DrawRect(rect, pygame.Color(180, 180, 180)))
+        self._commands.append(
+            _DrawRect(pygame.Rect(rect.left, rect.top, rect.w * pct, rect.h), color))
+
+    # retained panels
+
+    def panel(self, uid: str, *inputs) -> bool:
+        """
+        Starts a retained panel, whose widgets only depend on the given inputs.
+        If it was built before with the same inputs, its widgets are added again and False is returned.
+        Otherwise True is returned, and the widgets built until `end_panel` are kept for the next frames.
+        Panels are always rebuilt while the mouse is pressed, so that widgets can react to it.
+        """
+        self.end_panel()
+
+        cached = self._panels.get(uid)
+        if cached is not None and cached[0] == inputs and not self._mouse.pressed:
+            self._commands.extend(cached[1])
+            return False
+
+        if self._mouse.pressed:
+            # a widget reacting may cut the panel short, don't keep it
+            self._panels.pop(uid, None)
+        else:
+            self._recording = (uid, inputs, len(self._commands))
+
+        return True
+
+    def end_panel(self):
+        """
+        Ends the panel being built, if any.
+        """
+        if self._recording is None:
+            return
+
+        uid, inputs, start = self._recording
+        self._panels[uid] = (inputs, self._commands[start:])
+        self._recording = None
+
     # drawing
+    def begin(self):
+        """
+        Starts a new frame, discarding the widgets built by the previous one.
+        """
+        self.end_panel()
+        self._commands.clear()
+
+    def damage(self) -> list[pygame.Rect]:
+        """
+        Returns the areas of the screen where the widgets differ from the ones drawn last,
+        covering both where the old widgets were and where the new ones go.
+        Empty if the next `draw` would produce the same picture.
+        """
+        rects = []
+
+        for i in range(max(len(self._drawn), len(self._commands))):
+            old = self._drawn[i] if i < len(self._drawn) else None
+            new = self._commands[i] if i < len(self._commands) else None
+
+            if old == new:
+                continue
+
+            if old is not None:
+                rects.append(self._bounds(old))
+            if new is not None:
+                rects.append(self._bounds(new))
+
+        return rects
+
     def draw(self, screen: pygame.Surface):
         """
-        Draws the widgets built this frame to the screen.
+        Draws the widgets built since the last call to `begin` to the screen.
         """
         for cmd in self._commands:
             if isinstance(cmd, _DrawRect):
                 pygame.draw.rect(screen, cmd.color, cmd.rect, cmd.border)
             elif isinstance(cmd, _DrawText):
                 screen.blit(cmd.text, cmd.rect)
+            elif isinstance(cmd, _DrawGlyphs):
+                screen.blits(cmd.blits, doreturn=False)
             elif isinstance(cmd, _DrawImage):
-                img = self._images.unsafe_get(cmd.uid)
-                if cmd.crop is not None:
-                    img = img.subsurface(cmd.crop)
+                scaled = self._images.transformed(
+                    cmd.uid, cmd.crop, self._image_size(cmd))
+                screen.blit(scaled, cmd.rect)
 
-                aspect = img.get_rect().w / img.get_rect().h
+        self._drawn = list(self._commands)
 
-                scale = (int(cmd.rect.h * aspect), cmd.rect.h)
+    def _atlas(self, uid: FontId | None, text: str) -> GlyphAtlas | None:
+        """
+        Returns the glyph atlas to draw the text with, if the font has one covering it.
+        """
+        atlas = self.atlases.get(uid) if uid is not None else None
+        if atlas is None or not atlas.covers(text):
+            return None
+        return atlas
 
-                scaled = pygame.transform.scale(img, scale)
-                screen.blit(scaled, cmd.rect)
+    def _image_size(self, cmd: _DrawImage) -> tuple[int, int]:
+        """
+        Returns the size the image is drawn at, keeping its aspect ratio.
+        """
+        if cmd.crop is not None:
+            w, h = cmd.crop[2], cmd.crop[3]
+        else:
+            w, h = self._images.unsafe_get(cmd.uid).get_size()
 
-        self._commands.clear()
+        return (int(cmd.rect.h * (w / h)), cmd.rect.h)
+
+    def _bounds(self, cmd: _Command) -> pygame.Rect:
+        """
+        Returns the area of the screen a widget draws to.
+        """
+        if isinstance(cmd, _DrawText):
+            return cmd.rect.union(cmd.text.get_rect(topleft=cmd.rect.topleft))
+        elif isinstance(cmd, _DrawGlyphs):
+            return cmd.rect.union(pygame.Rect(cmd.rect.topleft, cmd.size))
+        elif isinstance(cmd, _DrawImage):
+            return pygame.Rect(cmd.rect.topleft, self._image_size(cmd))
+
+        return pygame.Rect(cmd.rect)
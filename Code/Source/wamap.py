@@ -0,0 +1,171 @@
+"""
+    compiled map format (.wamap), little-endian
+
+    header:
+        - magic: 4s                 # b"WAMP"
+        - version: u16
+        - width: u32                # width of the map in tiles
+        - height: u32               # height of the map in tiles
+        - name: i32                 # string index
+        - background: i32           # string index, -1 if none
+        - tileset: i32              # string index, path to the tileset relative to "Resources/Maps"
+        - strings: u32, u32         # offset and count of the string table
+        - objects: u32, u32         # offset and count of the object table
+        - tiles: u32                # offset of the tile layer
+
+    string table:
+        - length: u32, then the utf-8 bytes
+
+    object table, one record per object:
+        - image: i32                # string index
+        - area: 4 x i16             # as in the map file
+        - offset: 2 x f64           # position in tiles
+        - properties: i32           # string index of the properties as JSON, -1 if none
+
+    tile layer:
+        - width * height x u16      # aligned to 8 bytes
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any
+
+import numpy as np
+
+
+MAGIC = b"WAMP"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sHIIiiiIIIII")
+_OBJECT = struct.Struct("<ihhhhddi")
+_LENGTH = struct.Struct("<I")
+
+
+class InvalidMap(Exception):
+    pass
+
+
+def write(path: str, data: dict[str, Any]):
+    """
+    Compiles a map, in the same shape as the JSON map files, to the given path.
+    """
+    strings: dict[str, int] = {}
+
+    def string(value: str | None) -> int:
+        if value is None:
+            return -1
+        return strings.setdefault(value, len(strings))
+
+    height = int(data["height"])
+    tiles = np.asarray(data["tiles"], dtype="<u2")
+    width = len(tiles) // height
+
+    name = string(data["name"])
+    background = string(data.get("background"))
+    tileset = string(data["tileset"])
+
+    objects = b"".join(
+        _OBJECT.pack(
+            string(obj["image"]),
+            *(int(v) for v in obj["area"]),
+            float(obj["offset"]["x"]), float(obj["offset"]["y"]),
+            string(json.dumps(obj["properties"])) if "properties" in obj else -1,
+        )
+        for obj in data.get("objects", [])
+    )
+
+    table = b"".join(
+        _LENGTH.pack(len(encoded)) + encoded
+        for encoded in (s.encode("utf-8") for s in strings)
+    )
+
+    strings_offset = _HEADER.size
+    objects_offset = strings_offset + len(table)
+    tiles_offset = _align(objects_offset + len(objects), 8)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, VERSION, width, height,
+            name, background, tileset,
+            strings_offset, len(strings),
+            objects_offset, len(data.get("objects", [])),
+            tiles_offset,
+        ))
+        f.write(table)
+        f.write(objects)
+        f.write(bytes(tiles_offset - objects_offset - len(objects)))
+        f.write(tiles[:width * height].tobytes())
+
+
+def read(path: str) -> dict[str, Any]:
+    """
+    Reads a compiled map, in the same shape as the JSON map files.
+    The tiles are a read-only uint16 array mapped from the file, they are never copied.
+    The mapping is kept under "mmap", it is released with the last reference to the tiles,
+    or right away by `close`.
+    """
+    with open(path, "rb") as f:
+        # an empty file can't even be mapped
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise InvalidMap(path)
+
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magic, version, width, height,
+     name, background, tileset,
+     strings_offset, strings_count,
+     objects_offset, objects_count,
+     tiles_offset) = _HEADER.unpack_from(buffer)
+
+    if magic != MAGIC or version != VERSION:
+        buffer.close()
+        raise InvalidMap(path)
+
+    # the tile layer comes last, a truncated file ends before it does
+    if tiles_offset + width * height * 2 > len(buffer):
+        buffer.close()
+        raise InvalidMap(path)
+
+    strings = []
+    offset = strings_offset
+    for _ in range(strings_count):
+        (length,) = _LENGTH.unpack_from(buffer, offset)
+        offset += _LENGTH.size
+        strings.append(buffer[offset:offset + length].decode("utf-8"))
+        offset += length
+
+    objects = []
+    for image, x, y, w, h, ox, oy, properties in _OBJECT.iter_unpack(
+            buffer[objects_offset:objects_offset + objects_count * _OBJECT.size]):
+        obj: dict[str, Any] = {
+            "image": strings[image],
+            "area": [x, y, w, h],
+            "offset": {"x": ox, "y": oy},
+        }
+        if properties >= 0:
+            obj["properties"] = json.loads(strings[properties])
+        objects.append(obj)
+
+    return {
+        "name": strings[name],
+        "background": strings[background] if background >= 0 else None,
+        "height": height,
+        "tileset": strings[tileset],
+        "tiles": np.frombuffer(buffer, dtype="<u2", count=width * height, offset=tiles_offset),
+        "objects": objects,
+        "mmap": buffer,
+    }
+
+
+def close(data: dict[str, Any]):
+    """
+    Unmaps a map returned by `read`, whose tiles must not be used anymore.
+    """
+    del data["tiles"]
+    data.pop("mmap").close()
+
+
+def _align(offset: int, alignment: int) -> int:
+    return (offset + alignment - 1) // alignment * alignment
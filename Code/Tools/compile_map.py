@@ -0,0 +1,35 @@
+"""
+    Compiles JSON maps to the binary .wamap format, see Source/wamap.py.
+
+    Run from the `Code` folder:
+        python -m Tools.compile_map Resources/Maps/level1.json [output.wamap]
+
+    By default the output is written next to the input, with the .wamap extension.
+    The tileset stays a JSON file, the compiled map refers to it by the same path.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from Source import wamap
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a JSON map to .wamap")
+    parser.add_argument("input", type=Path, help="the JSON map")
+    parser.add_argument("output", type=Path, nargs="?", help="the compiled map")
+    args = parser.parse_args()
+
+    output = args.output or args.input.with_suffix(".wamap")
+
+    with open(args.input, "r") as f:
+        data = json.load(f)
+
+    wamap.write(str(output), data)
+
+    print(f"{args.input} -> {output} ({output.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
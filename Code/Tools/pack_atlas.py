@@ -0,0 +1,147 @@
+"""
+    Packs the sprite sheets into one or a few atlas pages, see ImageCache.
+
+    Run from the `Code` folder:
+        python -m Tools.pack_atlas [images...] [--size 1024] [--padding 1]
+
+    By default every PNG in Resources/Images is packed, into `atlas0.png`, `atlas1.png`...
+    next to them, along with the manifest `atlas.json`:
+
+        {
+            "pages": ["atlas0.png", ...],
+            "images": {
+                "player.png": {"page": 0, "rect": [x, y, w, h], "colorkey": [r, g, b]},
+                ...
+            }
+        }
+
+    An area of an image is the same area of its rect. The colorkeys of the tilesets in
+    Resources/Maps are made transparent in the pages, so they need no colorkey at runtime.
+    The background (bg.jpg) is left out: it's drawn on its own, and Level darkens it in place.
+    Pack again after changing any of the images, and delete the manifest to stop using the atlas.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import pygame
+
+
+IMAGES = Path("Resources/Images")
+MAPS = Path("Resources/Maps")
+
+MANIFEST = "atlas.json"
+
+
+def _colorkeys() -> dict[str, tuple[int, int, int]]:
+    """
+    The colorkey of every tileset image.
+    """
+    colorkeys = {}
+
+    for path in MAPS.glob("*.ts.json"):
+        with open(path, "r") as f:
+            ts = json.load(f)
+
+        if ts.get("colorkey") is not None:
+            colorkeys[ts["image"]] = tuple(ts["colorkey"])
+
+    return colorkeys
+
+
+def _pack(sizes: dict[str, tuple[int, int]], size: int, padding: int) -> list[dict[str, tuple[int, int]]]:
+    """
+    Places the images on shelves, tallest first, starting a new page when one is full.
+    Returns the position of every image on every page.
+    """
+    pages: list[dict[str, tuple[int, int]]] = []
+
+    x = y = shelf = size  # no page yet
+
+    for name in sorted(sizes, key=lambda n: (sizes[n][1], sizes[n][0]), reverse=True):
+        w, h = sizes[name]
+
+        if w > size or h > size:
+            raise ValueError(f"{name} ({w}x{h}) doesn't fit in a {size}x{size} page")
+
+        if x + w > size:
+            # next shelf
+            x, y = 0, y + shelf
+            shelf = 0
+
+        if y + h > size:
+            pages.append({})
+            x = y = shelf = 0
+
+        pages[-1][name] = (x, y)
+
+        x += w + padding
+        shelf = max(shelf, h + padding)
+
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the sprite sheets into atlas pages")
+    parser.add_argument("images", nargs="*", help="the images, relative to Resources/Images")
+    parser.add_argument("--size", type=int, default=1024, help="the largest page size")
+    parser.add_argument("--padding", type=int, default=1, help="the space between the images")
+    args = parser.parse_args()
+
+    names = args.images or sorted(
+        path.name for path in IMAGES.glob("*.png") if not path.name.startswith("atlas"))
+
+    colorkeys = _colorkeys()
+    sheets = {}
+
+    for name in names:
+        sheet = pygame.image.load(str(IMAGES / name))
+
+        if name in colorkeys:
+            sheet.set_colorkey(colorkeys[name])
+
+        rgba = pygame.Surface(sheet.get_size(), pygame.SRCALPHA)  # transparent black
+        if sheet.get_flags() & pygame.SRCALPHA:
+            # copied as is, alpha included
+            rgba.blit(sheet, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            # opaque, but for the colorkey
+            rgba.blit(sheet, (0, 0))
+
+        sheets[name] = rgba
+
+    pages = _pack({name: sheet.get_size() for name, sheet in sheets.items()}, args.size, args.padding)
+
+    manifest: dict = {"pages": [], "images": {}}
+
+    for i, placed in enumerate(pages):
+        # trim the page to what it holds
+        w = max(x + sheets[name].get_width() for name, (x, _) in placed.items())
+        h = max(y + sheets[name].get_height() for name, (_, y) in placed.items())
+
+        page = pygame.Surface((w, h), pygame.SRCALPHA)
+
+        for name, (x, y) in placed.items():
+            page.blit(sheets[name], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+
+            entry: dict = {"page": i, "rect": [x, y, *sheets[name].get_size()]}
+            if name in colorkeys:
+                entry["colorkey"] = list(colorkeys[name])
+
+            manifest["images"][name] = entry
+
+        file = f"atlas{i}.png"
+        pygame.image.save(page, str(IMAGES / file))
+        manifest["pages"].append(file)
+
+        print(f"{file}: {w}x{h}, {', '.join(placed)}")
+
+    with open(IMAGES / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    print(f"{IMAGES / MANIFEST}: {len(manifest['images'])} images on {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
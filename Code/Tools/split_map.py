@@ -0,0 +1,90 @@
+"""
+    Cuts a map in chunks which are loaded as the camera gets near them, see Source/map_stream.py.
+
+    Run from the `Code` folder:
+        python -m Tools.split_map Resources/Maps/level1.json [output.stream] [--chunk 32]
+
+    By default the output is a folder next to the input, with the .stream extension.
+    A level whose file ends in .stream is played streamed.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from Source import map_stream, wamap
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cut a map in chunks for streaming")
+    parser.add_argument("input", type=Path, help="the map, JSON or compiled")
+    parser.add_argument("output", type=Path, nargs="?", help="the folder of the chunks")
+    parser.add_argument("--chunk", type=int, default=32, help="the size of the chunks in tiles")
+    args = parser.parse_args()
+
+    output = args.output or args.input.with_suffix(".stream")
+    size = args.chunk
+
+    if args.input.suffix == ".wamap":
+        data = wamap.read(str(args.input))
+    else:
+        with open(args.input, "r") as f:
+            data = json.load(f)
+
+    height = int(data["height"])
+    width = len(data["tiles"]) // height
+    grid = np.asarray(data["tiles"], dtype=np.uint16)[:width * height].reshape(height, width)
+
+    # the objects go in the chunk they start in
+    objects: dict[tuple[int, int], list] = {}
+    start = (0.0, 0.0)
+
+    for obj in data.get("objects", []):
+        x, y = float(obj["offset"]["x"]), float(obj["offset"]["y"])
+        key = (min(max(int(x), 0), width - 1) // size, min(max(int(y), 0), height - 1) // size)
+        objects.setdefault(key, []).append(obj)
+
+        if obj.get("properties", {}).get("type") == "player":
+            start = (x, y)
+
+    output.mkdir(parents=True, exist_ok=True)
+
+    chunks = []
+
+    for cy in range((height + size - 1) // size):
+        for cx in range((width + size - 1) // size):
+            block = grid[cy * size:(cy + 1) * size, cx * size:(cx + 1) * size]
+
+            if not block.any() and (cx, cy) not in objects:
+                continue
+
+            wamap.write(str(output / f"{cx}_{cy}.wamap"), {
+                "name": data["name"],
+                "background": data.get("background"),
+                "tileset": data["tileset"],
+                "height": block.shape[0],
+                "tiles": block.ravel(),
+                "objects": objects.get((cx, cy), []),
+            })
+
+            chunks.append([cx, cy])
+
+    with open(output / map_stream.INDEX, "w") as f:
+        json.dump({
+            "name": data["name"],
+            "background": data.get("background"),
+            "tileset": data["tileset"],
+            "width": width,
+            "height": height,
+            "chunk": size,
+            "start": start,
+            "chunks": chunks,
+        }, f)
+
+    print(f"{args.input} -> {output} ({len(chunks)} chunks of {size}x{size} tiles)")
+
+
+if __name__ == "__main__":
+    main()